@@ -72,12 +72,17 @@ def save_faqs(faqs: List[dict]) -> bool:
         return False
 
 
-def rebuild_rag_index():
-    """Trigger RAG index rebuild after FAQ changes."""
+async def rebuild_rag_index():
+    """Trigger RAG index rebuild after FAQ changes (off the event loop)."""
     try:
-        from engines.rag import get_rag_engine
-        rag = get_rag_engine()
-        return rag.rebuild_index()
+        from engines.rag import _get_rag_engine_async
+        from core.pipeline import clear_rag_cache, clear_response_cache
+        rag = await _get_rag_engine_async()
+        result = await rag.rebuild_index_async()
+        # Contexts prefetched and answers generated from the old index must not outlive it
+        clear_rag_cache()
+        clear_response_cache()
+        return result
     except Exception as e:
         print(f"Warning: Could not rebuild RAG index: {e}")
         return {"success": False, "message": str(e)}
@@ -160,7 +165,7 @@ async def create_faq(faq: FAQItem, user: dict = Depends(get_current_user)):
     faqs.append(new_faq)
     
     if save_faqs(faqs):
-        rebuild_rag_index()
+        await rebuild_rag_index()
         return {"success": True, "faq": new_faq, "message": "FAQ created successfully"}
     
     raise HTTPException(status_code=500, detail="Failed to save FAQ")
@@ -178,7 +183,7 @@ async def update_faq(faq_id: str, faq_update: FAQUpdateRequest, user: dict = Dep
             faqs[i]["category"] = faq_update.category
             
             if save_faqs(faqs):
-                rebuild_rag_index()
+                await rebuild_rag_index()
                 return {"success": True, "faq": faqs[i], "message": "FAQ updated successfully"}
             
             raise HTTPException(status_code=500, detail="Failed to save FAQ")
@@ -196,7 +201,7 @@ async def delete_faq(faq_id: str, user: dict = Depends(get_current_user)):
             deleted_faq = faqs.pop(i)
             
             if save_faqs(faqs):
-                rebuild_rag_index()
+                await rebuild_rag_index()
                 return {"success": True, "message": "FAQ deleted successfully", "deleted": deleted_faq}
             
             raise HTTPException(status_code=500, detail="Failed to delete FAQ")
@@ -219,7 +224,7 @@ async def apply_changes(user: dict = Depends(get_current_user)):
     Apply FAQ changes by rebuilding the RAG index.
     This makes the FAQ changes effective without server restart.
     """
-    result = rebuild_rag_index()
+    result = await rebuild_rag_index()
     if result.get("success"):
         return {
             "success": True,
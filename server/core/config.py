@@ -23,6 +23,7 @@ class ServerConfig(BaseModel):
     port: int = 8765
     workers: int = 4
     log_level: str = "INFO"
+    allow_json_audio: bool = False  # Legacy Base64 audio_frame messages (binary frames preferred)
 
 
 class AudioConfig(BaseModel):
@@ -99,6 +100,7 @@ class PerformanceConfig(BaseModel):
     session_timeout: int = 300
     interrupt_threshold_ms: int = 50
     vad_speech_min_duration_ms: int = 200
+    response_cache: bool = True  # Replay recent answers to repeated opening questions
 
 
 class VisionConfig(BaseModel):
@@ -133,6 +135,8 @@ class EnvironmentSettings(BaseSettings):
     environment: str = Field(default="production", alias="ENVIRONMENT")
     zeni_host: str = Field(default="0.0.0.0", alias="ZENI_HOST")
     zeni_port: int = Field(default=8765, alias="ZENI_PORT")
+    # Default executor for asyncio.to_thread work (RAG, image resize) - I/O-bound, so oversized
+    thread_pool_size: int = Field(default_factory=lambda: min(32, (os.cpu_count() or 4) * 2), alias="ZENI_THREAD_POOL")
 
     class Config:
         env_file = ".env"
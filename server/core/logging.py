@@ -12,6 +12,18 @@ from contextlib import contextmanager
 
 import structlog
 
+# Long string fields are cut here, only for lines that are actually emitted,
+# so call sites can pass raw values instead of slicing on every call
+LOG_VALUE_MAX_CHARS = 200
+
+
+def _truncate_long_values(logger: Any, method_name: str, event_dict: dict) -> dict:
+    """structlog processor: shorten oversized string values."""
+    for key, value in event_dict.items():
+        if isinstance(value, str) and len(value) > LOG_VALUE_MAX_CHARS:
+            event_dict[key] = value[:LOG_VALUE_MAX_CHARS] + "..."
+    return event_dict
+
 
 def setup_logging(log_level: str = "WARNING", production: bool = True) -> None:
     """Configure structured logging for Zeni.
@@ -27,6 +39,7 @@ def setup_logging(log_level: str = "WARNING", production: bool = True) -> None:
         processors = [
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="%H:%M:%S"),
+            _truncate_long_values,
             structlog.dev.ConsoleRenderer(colors=False, pad_event=0)
         ]
     else:
@@ -37,6 +50,7 @@ def setup_logging(log_level: str = "WARNING", production: bool = True) -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.dev.set_exc_info,
             structlog.processors.TimeStamper(fmt="iso"),
+            _truncate_long_values,
             structlog.dev.ConsoleRenderer(colors=True)
         ]
     
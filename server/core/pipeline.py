@@ -9,7 +9,9 @@ No intent matching - the LLM decides what actions to take.
 import asyncio
 import base64
 import time
-from typing import Optional, AsyncGenerator
+import unicodedata
+from collections import OrderedDict
+from typing import Optional, AsyncGenerator, List, Tuple
 from dataclasses import dataclass
 
 from core.config import config
@@ -24,7 +26,7 @@ from core.session import Session
 from core.logging import get_logger, pipeline_latency
 from engines.asr import ASRResult
 from engines.google_asr import GoogleASREngine
-from engines.llm import LLMEngine, LLMResponse
+from engines.llm import LLMEngine, LLMResponse, FALLBACK_RESPONSE
 from engines.tts import TTSEngine, TTSChunk
 
 # Import action engine for AI-driven actions
@@ -38,6 +40,11 @@ except ImportError:
 
 logger = get_logger("pipeline")
 
+# Repeated opening questions ("who are you?") replay a recent answer instead of LLM + TTS
+RESPONSE_CACHE_SIZE = 32
+RESPONSE_CACHE_TTL_SECONDS = 600.0
+_TRANSCRIPT_PUNCTUATION = str.maketrans("", "", "?.!,;:'\"।॥")  # incl. Devanagari danda
+
 
 @dataclass
 class PipelineConfig:
@@ -45,6 +52,47 @@ class PipelineConfig:
     interrupt_threshold_ms: int = 50
 
 
+@dataclass
+class CachedResponse:
+    """A finished turn's LLM tokens and TTS audio, ready to replay."""
+    tokens: Tuple[str, ...]
+    audio: Tuple[TTSChunk, ...]
+    full_response: str
+    created: float
+
+
+# Shared by all sessions: (normalized text, personality, language, voice, rate) -> response
+_response_cache: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+
+# Speculative RAG results by normalized partial transcript, shared by all sessions
+# but only reused on an exact match. A final may also extend its own utterance's
+# partial by one word, provided the partial is specific enough on its own.
+RAG_CACHE_SIZE = 64
+RAG_REUSE_MIN_PARTIAL_WORDS = 4
+RAG_REUSE_MAX_EXTRA_WORDS = 1
+_RAG_CACHE: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _rag_key(text: str) -> str:
+    """NFKC-normalized, trimmed, lowercased transcript."""
+    return unicodedata.normalize("NFKC", text).strip().lower()
+
+
+def clear_rag_cache() -> None:
+    """Drop prefetched RAG contexts (FAQ index rebuilt)."""
+    _RAG_CACHE.clear()
+
+
+def clear_response_cache() -> None:
+    """Drop cached answers (FAQ index rebuilt)."""
+    _response_cache.clear()
+
+
+def _normalize_transcript(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace."""
+    return " ".join(text.lower().translate(_TRANSCRIPT_PUNCTUATION).split())
+
+
 class StreamingPipeline:
     """
     ULTRA-OPTIMIZED Voice AI Pipeline.
@@ -77,6 +125,16 @@ class StreamingPipeline:
         self._speculative_text: Optional[str] = None
         self._speculative_cancelled = False
         
+        # Set when the current turn asked the client for a camera frame
+        self._image_requested = False
+        # Set when the current turn's LLM stream ended on a clean stop
+        self._llm_finished = False
+        
+        # Set once this utterance's speculative RAG prefetch has been issued
+        self.speculative_rag_started = False
+        # That prefetch's (partial words, context), for prefix reuse by this utterance only
+        self._utterance_rag: Optional[Tuple[List[str], str]] = None
+        
         self.config = PipelineConfig(
             interrupt_threshold_ms=config.performance.interrupt_threshold_ms
         )
@@ -119,7 +177,7 @@ class StreamingPipeline:
                     self._last_partial_text = result.text
                     self._last_partial_time = current_time
                     
-                    logger.info("partial_sent", text=result.text[:80])
+                    logger.info("partial_sent", text=result.text)
                     
                     # Send partial transcript
                     await session.send_message(TranscriptPartialMessage(
@@ -129,7 +187,7 @@ class StreamingPipeline:
             
             if result.is_final:
                 # Final transcript received from Google!
-                logger.info("final_transcript_received", text=result.text[:100], confidence=result.confidence)
+                logger.info("final_transcript_received", text=result.text, confidence=result.confidence)
                 await session.send_message(TranscriptFinalMessage(
                     text=result.text,
                     confidence=result.confidence,
@@ -140,7 +198,7 @@ class StreamingPipeline:
                 # Reset partial tracking
                 self._last_partial_text = ""
                 
-                logger.info("returning_true_for_is_final", text=result.text[:50])
+                logger.info("returning_true_for_is_final", text=result.text)
                 # Return True to signal final transcript received
                 return True
         
@@ -149,13 +207,11 @@ class StreamingPipeline:
     def get_pending_final_transcript(self) -> Optional[str]:
         """
         Get and clear any pending final transcript.
-        Called by the background poller in server.py.
+        Called by the frame handlers and speech_finished in server.py.
         """
-        if self._pending_final_text:
-            text = self._pending_final_text
-            self._pending_final_text = None
-            return text
-        return None
+        text = self._pending_final_text
+        self._pending_final_text = None
+        return text or None
     
     async def finalize_speech(self) -> bool:
         """
@@ -165,7 +221,7 @@ class StreamingPipeline:
         result = await self.asr.finalize()
         
         if result and result.text.strip():
-            logger.info("finalize_speech_got_result", text=result.text[:50])
+            logger.info("finalize_speech_got_result", text=result.text)
             self._pending_final_text = result.text
             self._last_partial_text = ""
             return True
@@ -179,7 +235,7 @@ class StreamingPipeline:
         This can save 200-500ms by starting LLM before is_final=True.
         If the final text differs significantly, we cancel and restart.
         """
-        logger.info("speculative_llm_start", text=partial_text[:50])
+        logger.info("speculative_llm_start", text=partial_text)
         self._speculative_text = partial_text
         self._speculative_cancelled = False
         
@@ -208,8 +264,8 @@ class StreamingPipeline:
         logger.info("speculative_validation", 
                    similarity=round(similarity, 2),
                    valid=valid,
-                   spec=self._speculative_text[:30],
-                   final=final_text[:30])
+                   spec=self._speculative_text,
+                   final=final_text)
         return valid
     
     def cancel_speculative(self):
@@ -221,6 +277,35 @@ class StreamingPipeline:
         self._speculative_text = None
         self._speculative_cancelled = True
     
+    def cache_rag(self, text: str, faq_context: str) -> None:
+        """Remember a speculative RAG result for the final transcript to pick up."""
+        key = _rag_key(text)
+        if not key or not faq_context:
+            return
+        _RAG_CACHE[key] = faq_context
+        _RAG_CACHE.move_to_end(key)
+        while len(_RAG_CACHE) > RAG_CACHE_SIZE:
+            _RAG_CACHE.popitem(last=False)
+        # Prefetches finishing after the utterance was reset belong to no utterance
+        if self.speculative_rag_started:
+            self._utterance_rag = (key.split(), faq_context)
+    
+    def get_cached_rag(self, text: str) -> Optional[str]:
+        """Prefetched RAG context usable for this transcript, if any."""
+        key = _rag_key(text)
+        cached = _RAG_CACHE.get(key)
+        if cached is not None:
+            return cached
+        # This utterance's partial, extended by a word ("fees for btech first" -> "... year")
+        if self._utterance_rag is not None:
+            partial_words, faq_context = self._utterance_rag
+            words = key.split()
+            if (len(partial_words) >= RAG_REUSE_MIN_PARTIAL_WORDS
+                    and len(words) - len(partial_words) <= RAG_REUSE_MAX_EXTRA_WORDS
+                    and words[:len(partial_words)] == partial_words):
+                return faq_context
+        return None
+    
     async def run_llm_stream(
         self,
         session: Session,
@@ -236,6 +321,7 @@ class StreamingPipeline:
         # Create callback for requesting image from client
         async def request_image_from_client():
             """Send REQUEST_IMAGE message to client."""
+            self._image_requested = True
             await session.send_message({
                 "type": MessageType.REQUEST_IMAGE.value,
                 "session_id": session.session_id
@@ -259,17 +345,19 @@ class StreamingPipeline:
             conversation_history=session.conversation_history.turns,
             language=session.detected_language,
             cancel_event=session.interrupt_event,
-            personality=session.config.personality,
+            personality=session.effective_personality,
             session_id=session.session_id,
             request_image_fn=request_image_from_client,
             robot_enabled=session.robot_connected,
-            robot_command_fn=send_robot_command if session.robot_connected else None
+            robot_command_fn=send_robot_command if session.robot_connected else None,
+            faq_context=self.get_cached_rag(transcript)
         ):
             if session.is_interrupted():
                 logger.info("llm_stream_interrupted", session_id=session.session_id)
                 return
             
             if response.is_complete:
+                self._llm_finished = response.finished
                 # Send completion message
                 await session.send_message(LLMCompleteMessage(
                     full_text=response.full_text or ""
@@ -336,6 +424,109 @@ class StreamingPipeline:
             sample_rate=audio_chunk.sample_rate
         ))
     
+    def _response_cache_key(self, session: Session, transcript: str) -> Optional[tuple]:
+        """Cache key for this turn, or None when the answer depends on more than the words."""
+        if not config.performance.response_cache or session.robot_connected:
+            return None
+        if session.conversation_history.turns:
+            return None  # Follow-ups depend on the conversation so far
+        try:
+            from engines.vision import get_vision_engine
+            if get_vision_engine().has_image(session.session_id):
+                return None  # May be answered from what the camera sees
+        except ImportError:
+            pass
+        normalized = _normalize_transcript(transcript)
+        if not normalized:
+            return None
+        return (normalized, session.effective_personality, session.detected_language,
+                session.config.voice_preference, session.config.speaking_rate)
+    
+    @staticmethod
+    def _get_cached_response(key: tuple) -> Optional[CachedResponse]:
+        """Unexpired cached response for key (LRU touch)."""
+        cached = _response_cache.get(key)
+        if cached is None:
+            return None
+        if time.time() - cached.created > RESPONSE_CACHE_TTL_SECONDS:
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return cached
+    
+    @staticmethod
+    def _store_cached_response(key: tuple, response: CachedResponse) -> None:
+        """Insert as most-recent and evict the oldest past RESPONSE_CACHE_SIZE."""
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    
+    async def _replay_response(self, session: Session, cached: CachedResponse) -> None:
+        """Send a cached turn to the client as if it had just been generated."""
+        for sequence, token in enumerate(cached.tokens, 1):
+            if session.is_interrupted():
+                return
+            await session.send_message(LLMTokenMessage(token=token, sequence=sequence))
+        await session.send_message(LLMCompleteMessage(full_text=cached.full_response))
+        
+        await session.transition_state(SessionState.SPEAKING)
+        for audio_chunk in cached.audio:
+            if session.is_interrupted():
+                return
+            await self.send_audio_response(session, audio_chunk)
+    
+    async def _execute_action(self, session: Session, full_response: str) -> str:
+        """Run the action block in an LLM response, if any; returns the text without it."""
+        clean_text = full_response
+        
+        if ACTIONS_AVAILABLE and parse_action_from_response:
+            clean_text, action_data = parse_action_from_response(full_response)
+            
+            if action_data:
+                logger.info("action_detected_by_llm", 
+                           session_id=session.session_id,
+                           action=action_data)
+                
+                # Execute the action (tour opens while voice is playing)
+                action_engine = get_action_engine()
+                action_type = action_data.get("action", "")
+                action_result = action_engine.execute_action(action_type, action_data)
+                
+                if action_result and action_result.action_type == "campus_tour":
+                    # Send campus tour message to client
+                    await session.send_message(CampusTourMessage(
+                        tour_id=action_result.data["tour_id"],
+                        name=action_result.data["name"],
+                        url=action_result.data["url"],
+                        description=action_result.data["description"]
+                    ))
+                    logger.info("campus_tour_action_sent",
+                               session_id=session.session_id,
+                               tour_name=action_result.data["name"])
+                
+                elif action_result and action_result.action_type == "fee_structure":
+                    # Send fee structure message to client
+                    await session.send_message(FeeStructureMessage(
+                        program_id=action_result.data["program_id"],
+                        program_name=action_result.data["program_name"],
+                        url=action_result.data["url"]
+                    ))
+                    logger.info("fee_structure_action_sent",
+                               session_id=session.session_id,
+                               program_name=action_result.data["program_name"])
+                
+                elif action_result and action_result.action_type == "show_placements":
+                    # Send placement gallery message to client
+                    await session.send_message(PlacementMessage(
+                        title=action_result.data["title"]
+                    ))
+                    logger.info("placements_action_sent",
+                               session_id=session.session_id,
+                               title=action_result.data["title"])
+        
+        return clean_text
+    
     async def run_full_pipeline(
         self,
         session: Session,
@@ -363,6 +554,10 @@ class StreamingPipeline:
         )
         
         start_time = time.perf_counter()
+        self._image_requested = False
+        self._llm_finished = False
+        cache_key = self._response_cache_key(session, transcript)
+        cached = self._get_cached_response(cache_key) if cache_key else None
         
         try:
             # Add user turn to history
@@ -371,6 +566,20 @@ class StreamingPipeline:
             # Transition to generating state
             await session.transition_state(SessionState.GENERATING)
             
+            if cached:
+                await self._replay_response(session, cached)
+                if session.is_interrupted():
+                    logger.info("response_replay_interrupted", session_id=session.session_id)
+                    return
+                clean_text = await self._execute_action(session, cached.full_response)
+                session.add_assistant_turn(clean_text, session.detected_language)
+                logger.info(
+                    "response_cache_hit",
+                    session_id=session.session_id,
+                    total_time_ms=round((time.perf_counter() - start_time) * 1000, 2)
+                )
+                return
+            
             logger.info("llm_request_starting", session_id=session.session_id)
             
             # ========== STREAM LLM → TTS (FAST) + ACCUMULATE FOR ACTIONS ==========
@@ -438,6 +647,7 @@ class StreamingPipeline:
             # Transition to speaking once TTS starts
             first_audio = True
             audio_chunk_count = 0
+            captured_audio: List[TTSChunk] = []
             
             logger.info("starting_tts_stream", session_id=session.session_id)
             # Stream TTS from LLM output - voice starts FAST!
@@ -459,6 +669,8 @@ class StreamingPipeline:
                 
                 # Send chunk immediately
                 await self.send_audio_response(session, audio_chunk)
+                if cache_key:
+                    captured_audio.append(audio_chunk)
                 logger.debug("audio_chunk_sent", 
                             session_id=session.session_id,
                             chunk_num=audio_chunk_count,
@@ -467,56 +679,22 @@ class StreamingPipeline:
             # ========== PARSE ACTIONS AFTER TTS STARTED ==========
             # Voice is already playing, now check for actions (delayed is OK)
             full_response = "".join(accumulated_response).strip()
-            clean_text = full_response
-            
-            if ACTIONS_AVAILABLE and parse_action_from_response:
-                clean_text, action_data = parse_action_from_response(full_response)
-                
-                if action_data:
-                    logger.info("action_detected_by_llm", 
-                               session_id=session.session_id,
-                               action=action_data)
-                    
-                    # Execute the action (tour opens while voice is playing)
-                    action_engine = get_action_engine()
-                    action_type = action_data.get("action", "")
-                    action_result = action_engine.execute_action(action_type, action_data)
-                    
-                    if action_result and action_result.action_type == "campus_tour":
-                        # Send campus tour message to client
-                        await session.send_message(CampusTourMessage(
-                            tour_id=action_result.data["tour_id"],
-                            name=action_result.data["name"],
-                            url=action_result.data["url"],
-                            description=action_result.data["description"]
-                        ))
-                        logger.info("campus_tour_action_sent",
-                                   session_id=session.session_id,
-                                   tour_name=action_result.data["name"])
-                    
-                    elif action_result and action_result.action_type == "fee_structure":
-                        # Send fee structure message to client
-                        await session.send_message(FeeStructureMessage(
-                            program_id=action_result.data["program_id"],
-                            program_name=action_result.data["program_name"],
-                            url=action_result.data["url"]
-                        ))
-                        logger.info("fee_structure_action_sent",
-                                   session_id=session.session_id,
-                                   program_name=action_result.data["program_name"])
-                    
-                    elif action_result and action_result.action_type == "show_placements":
-                        # Send placement gallery message to client
-                        await session.send_message(PlacementMessage(
-                            title=action_result.data["title"]
-                        ))
-                        logger.info("placements_action_sent",
-                                   session_id=session.session_id,
-                                   title=action_result.data["title"])
+            clean_text = await self._execute_action(session, full_response)
             
             # Add to conversation history (clean text without action block)
             session.add_assistant_turn(clean_text, session.detected_language)
             
+            # Only complete answers: no fallback text, no timeout/error cut-off
+            if (cache_key and captured_audio and not self._image_requested
+                    and self._llm_finished and full_response != FALLBACK_RESPONSE
+                    and not session.is_interrupted()):
+                self._store_cached_response(cache_key, CachedResponse(
+                    tokens=tuple(accumulated_response),
+                    audio=tuple(captured_audio),
+                    full_response=full_response,
+                    created=time.time()
+                ))
+            
             # Pipeline complete
             total_time = (time.perf_counter() - start_time) * 1000
             logger.info(
@@ -554,6 +732,8 @@ class StreamingPipeline:
         session.audio_sequence = 0
         self._pending_final_text = None
         self._last_partial_text = ""
+        self.speculative_rag_started = False
+        self._utterance_rag = None
 
 
 class PipelineManager:
@@ -3,12 +3,62 @@ Zeni Protocol Definitions
 Defines all message types and data structures for WebSocket communication.
 """
 
+import json
 from enum import Enum
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 import uuid
 
+# orjson decodes/encodes WebSocket control messages several times faster than stdlib json
+try:
+    import orjson
+    
+    def encode_message(data: Dict[str, Any]) -> str:
+        """Serialize an outgoing message to a JSON text frame."""
+        return orjson.dumps(data).decode()
+    
+    decode_message = orjson.loads
+except ImportError:
+    def encode_message(data: Dict[str, Any]) -> str:
+        """Serialize an outgoing message to a JSON text frame."""
+        return json.dumps(data, separators=(",", ":"))
+    
+    decode_message = json.loads
+
+# Optional MessagePack wire format, negotiated per connection via subprotocol.
+# Binary frames then carry a 1-byte tag: raw PCM audio or a msgpack control message.
+try:
+    import msgspec
+    _msgpack_encoder = msgspec.msgpack.Encoder()
+    decode_msgpack = msgspec.msgpack.Decoder().decode
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    decode_msgpack = None
+    MSGPACK_AVAILABLE = False
+
+MSGPACK_SUBPROTOCOL = "msgpack-v1"
+FRAME_TAG_AUDIO = 0x00
+FRAME_TAG_CONTROL = 0x01
+_CONTROL_TAG = bytes((FRAME_TAG_CONTROL,))
+
+
+async def send_control_message(websocket: Any, data: Dict[str, Any]) -> None:
+    """Send a control message in the connection's negotiated format (msgpack or JSON text)."""
+    if getattr(websocket.state, "msgpack", False):
+        await websocket.send_bytes(_CONTROL_TAG + _msgpack_encoder.encode(data))
+    else:
+        await websocket.send_text(encode_message(data))
+
+
+async def send_control_model(websocket: Any, model: BaseModel) -> None:
+    """Send a pydantic message in the connection's negotiated format."""
+    if getattr(websocket.state, "msgpack", False):
+        await websocket.send_bytes(_CONTROL_TAG + _msgpack_encoder.encode(model.model_dump()))
+    else:
+        # OPTIMIZED: pydantic-core renders JSON directly - no intermediate dict
+        await websocket.send_text(model.model_dump_json())
+
 
 class MessageType(str, Enum):
     """WebSocket message types."""
@@ -13,16 +13,20 @@ from dataclasses import dataclass, field
 from fastapi import WebSocket
 
 from .protocol import (
-    SessionState, Language, ConversationTurn, ConversationHistory,
+    SessionState, Language, Personality, ConversationTurn, ConversationHistory,
     SessionConfig, SessionAckMessage, StateChangeMessage, ErrorMessage,
     PlaybackStopMessage, TranscriptPartialMessage, TranscriptFinalMessage,
-    LLMTokenMessage, LLMCompleteMessage, AudioResponseMessage
+    LLMTokenMessage, LLMCompleteMessage, AudioResponseMessage, send_control_message,
+    send_control_model
 )
 from .config import config
 from .logging import get_logger
 
 logger = get_logger("session")
 
+# How often pending activity timestamps are committed to Session.last_activity
+ACTIVITY_FLUSH_INTERVAL = 1.0  # seconds
+
 
 @dataclass
 class Session:
@@ -55,6 +59,7 @@ class Session:
     # Timing
     created_at: datetime = field(default_factory=datetime.now)
     last_activity: datetime = field(default_factory=datetime.now)
+    activity_pending: float = 0.0  # time.time() of uncommitted activity, 0 when clean
     
     # Audio buffer
     audio_buffer: bytearray = field(default_factory=bytearray)
@@ -66,6 +71,11 @@ class Session:
     # Robot connection state
     robot_connected: bool = False
     
+    # Per-session personality (from a personality_change message); only valid until
+    # the next global change, tracked by the manager's generation counter
+    personality_override: Optional[Personality] = None
+    personality_override_generation: int = -1
+    
     def __post_init__(self):
         """Initialize session."""
         self.interrupt_event = asyncio.Event()
@@ -75,10 +85,11 @@ class Session:
         """Send a message to the client."""
         try:
             if hasattr(message, 'model_dump'):
-                await self.websocket.send_json(message.model_dump())
+                await send_control_model(self.websocket, message)
             else:
-                await self.websocket.send_json(message)
-            self.last_activity = datetime.now()
+                await send_control_message(self.websocket, message)
+            # Through the pending timestamp like all activity, so a flush never moves it back
+            self.update_activity()
         except Exception as e:
             logger.error("send_message_failed", session_id=self.session_id, error=str(e))
     
@@ -177,9 +188,23 @@ class Session:
         elapsed = (datetime.now() - self.last_activity).total_seconds()
         return elapsed > timeout
     
+    @property
+    def effective_personality(self) -> Personality:
+        """Personality for the next turn: session override, else the global setting."""
+        if (self.personality_override is not None
+                and self.personality_override_generation == session_manager.personality_generation):
+            return self.personality_override
+        return session_manager.global_personality
+    
+    def set_personality_override(self, personality: Personality) -> None:
+        """Switch only this session's personality."""
+        self.personality_override = personality
+        self.personality_override_generation = session_manager.personality_generation
+    
     def update_activity(self) -> None:
-        """Update last activity timestamp."""
-        self.last_activity = datetime.now()
+        """Mark activity; the manager commits it to last_activity on its next flush."""
+        # OPTIMIZED: called per audio frame - one float store instead of building a datetime
+        self.activity_pending = time.time()
 
 
 class SessionManager:
@@ -191,21 +216,34 @@ class SessionManager:
         self.sessions: Dict[str, Session] = {}
         self.max_sessions = config.performance.max_sessions
         self._cleanup_task: Optional[asyncio.Task] = None
+        self._activity_flush_task: Optional[asyncio.Task] = None
         self.logger = get_logger("session_manager")
+        
+        # OPTIMIZED: one shared reference read lazily per turn instead of rewriting
+        # every session's config; bumping the generation voids per-session overrides
+        self.global_personality: Personality = Personality.ASSISTANT
+        self.personality_generation = 0
+    
+    def set_global_personality(self, personality: Personality) -> None:
+        """Apply a personality to every session (O(1) - sessions read it per turn)."""
+        self.global_personality = personality
+        self.personality_generation += 1
     
     async def start(self) -> None:
         """Start the session manager."""
         self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+        self._activity_flush_task = asyncio.create_task(self._activity_flush_loop())
         self.logger.info("session_manager_started")
     
     async def stop(self) -> None:
         """Stop the session manager and cleanup all sessions."""
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._cleanup_task, self._activity_flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         
         # Close all sessions
         for session_id in list(self.sessions.keys()):
@@ -265,6 +303,7 @@ class SessionManager:
     
     def get_active_sessions(self) -> list[Dict[str, Any]]:
         """Get list of active sessions info."""
+        self._flush_activity()
         return [
             {
                 "session_id": s.session_id,
@@ -287,8 +326,28 @@ class SessionManager:
             except Exception as e:
                 self.logger.error("cleanup_error", error=str(e))
     
+    async def _activity_flush_loop(self) -> None:
+        """Periodically commit pending activity timestamps."""
+        while True:
+            try:
+                await asyncio.sleep(ACTIVITY_FLUSH_INTERVAL)
+                self._flush_activity()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error("activity_flush_error", error=str(e))
+    
+    def _flush_activity(self) -> None:
+        """Commit each session's pending activity to last_activity."""
+        for session in self.sessions.values():
+            pending = session.activity_pending
+            if pending:
+                session.activity_pending = 0.0
+                session.last_activity = datetime.fromtimestamp(pending)
+    
     async def _cleanup_expired_sessions(self) -> None:
         """Remove expired sessions."""
+        self._flush_activity()
         expired = [
             session_id 
             for session_id, session in self.sessions.items() 
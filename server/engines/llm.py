@@ -5,21 +5,31 @@ Groq provides ~200-400ms first token latency - 10x faster than local Ollama.
 """
 
 import asyncio
+import heapq
+import io
+import itertools
 import json
 import time
-from typing import Optional, AsyncGenerator, List, Dict, Any, Callable, Awaitable
+from collections import OrderedDict
+from typing import Optional, AsyncGenerator, List, Dict, Tuple, Any, Callable, Awaitable
 from dataclasses import dataclass
 
 import aiohttp
 
+# orjson parses the per-token SSE chunks several times faster than stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from core.config import config
 from core.protocol import Language, ConversationTurn, Personality
 from core.logging import get_logger, llm_latency
 
 # Import RAG engine for FAQ search
 try:
-    from engines.rag import get_faq_context
-    RAG_AVAILABLE = True
+    from engines.rag import get_faq_context, RAG_DEPS_AVAILABLE as RAG_AVAILABLE
 except ImportError:
     RAG_AVAILABLE = False
     get_faq_context = None
@@ -38,6 +48,58 @@ logger = get_logger("llm")
 # Groq API Configuration
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 
+# Shared request settings - built once instead of per request
+_TOOL_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=5)  # Quick timeout
+_WARMUP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+_HEALTH_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# OPTIMIZED: Static tool-router system prompt kept byte-identical across calls
+# so Groq's prompt-prefix cache can reuse it; the user message is the only
+# variable part of the tool-check request.
+_TOOL_CHECK_SYSTEM = """You are Zeni, an AI with EYES and a physical BODY (robot).
+
+VISION: You have eyesight. When the user asks about:
+- How they look, their appearance, outfit, or style
+- Checking something out or giving visual feedback
+- Reading something, looking at a document or object
+- What you can see, what's in front of you
+You MUST call the 'look_with_eyes' function.
+
+ROBOT BODY: You can MOVE physically. When the user asks you to:
+- Come closer, approach them, come here
+- Move away, go back, step back
+- Turn around, spin, rotate
+- Move forward, backward, left, right
+- Any physical movement
+You MUST call the 'control_robot' function.
+
+Use tools naturally. Never refuse when tools match the request."""
+
+# SSE framing and finish reasons that end a streamed reply
+_SSE_DATA_PREFIX = b"data: "
+_SSE_DONE = b"data: [DONE]"
+_FINISH_STOP = frozenset(("stop", "length"))
+_FINISH_FILTER = "content_filter"
+
+# Reply used when the stream is filtered or yields no tokens
+FALLBACK_RESPONSE = "I'm sorry, I cannot respond to that. Is there something else I can help you with?"
+
+# Vision pre-analysis: how long the tool call may wait before streaming starts
+# without it, and the overall budget for the follow-up once it resolves
+VISION_FAST_WAIT_SECONDS = 0.5
+VISION_FOLLOWUP_WAIT_SECONDS = 8.0
+
+# Tool decisions prefetched from a speculative partial; used once by an identical final
+TOOL_DECISION_CACHE_SIZE = 32
+TOOL_DECISION_TTL_SECONDS = 30.0
+
+# Placeholder context used when pre-analysis is still running. The real result
+# is streamed afterwards as a continuation of the same reply.
+VISION_PENDING_CONTEXT = (
+    "[Vision: you are still looking at the user - visual details are not ready yet. "
+    "Answer briefly without describing what you see; you will continue once you can see.]"
+)
+
 # ============== Personality Prompts ==============
 # These prompts modify how the AI responds based on personality mode
 
@@ -58,12 +120,13 @@ GROQ_MODELS = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
-    """LLM response chunk."""
+    """LLM response chunk (slotted - one is allocated per streamed token)."""
     token: str
     is_complete: bool
     full_text: Optional[str] = None
+    finished: bool = False  # Completion ended on a clean stop (not a fallback/timeout/cut-off)
 
 
 class GroqLLMEngine:
@@ -79,13 +142,17 @@ class GroqLLMEngine:
         # Groq API keys for rotation
         self.api_keys = config.llm.api_keys if config.llm.api_keys else []
         self.api_key_rotation = config.llm.api_key_rotation
-        self._current_key_index = 0
         
         # Model configuration
         self.model = config.llm.model  # GPT-OSS for main conversation + function calling
         self.temperature = config.llm.temperature
         self.max_tokens = config.llm.max_tokens
         self.timeout = config.llm.timeout
+        self._stream_timeout = aiohttp.ClientTimeout(
+            total=self.timeout,
+            connect=5,  # Fast connection timeout
+            sock_read=self.timeout
+        )
         
         # System prompts from config
         self.system_prompt = config.system_prompt
@@ -98,37 +165,56 @@ class GroqLLMEngine:
         
         # Track key failures for smart rotation
         self._key_failures = {}
-        self._key_rate_limited_until = {}
+        
+        # Key availability heap: (available_at, last_used_seq, key_index).
+        # available_at is time.monotonic() based (0.0 = usable now); the use
+        # sequence breaks ties so available keys are still used round-robin.
+        self._key_use_seq = itertools.count()
+        self._key_heap: List[Tuple[float, int, int]] = [
+            (0.0, next(self._key_use_seq), i) for i in range(len(self.api_keys))
+        ]
+        self._key_index_by_value = {key: i for i, key in enumerate(self.api_keys)}
+        
+        # (normalized message, tool names) -> (timestamp, (function name, args)); "" name = no tool
+        self._tool_decisions: "OrderedDict[tuple, tuple]" = OrderedDict()
+        
+        # Vision engine accessor, resolved once in initialize() (None if unavailable)
+        self._get_vision: Optional[Callable[[], Any]] = None
+        self._vision_min_chars: Optional[int] = None
+        
+        # Background RAG preload (see initialize)
+        self._rag_warmup_task: Optional[asyncio.Task] = None
+        
+        # Per-key request headers (only Authorization differs between keys)
+        self._header_cache: Dict[str, Dict[str, str]] = {}
     
     async def initialize(self) -> bool:
         """Initialize the LLM engine with persistent connection."""
         try:
-            # Pre-initialize RAG engine (lazy load on separate thread to not block startup)
+            # Resolve optional engine modules once instead of importing per turn
+            try:
+                from engines.vision import get_vision_engine, PRE_ANALYSIS_MIN_CHARS
+                self._get_vision = get_vision_engine
+                self._vision_min_chars = PRE_ANALYSIS_MIN_CHARS
+            except ImportError:
+                self._get_vision = None
+            
+            # Pre-initialize RAG engine in a worker thread (tracked so it can be awaited/cancelled)
             if RAG_AVAILABLE:
-                import threading
-                def init_rag():
-                    try:
-                        from engines.rag import get_rag_engine
-                        get_rag_engine()
-                        logger.info("rag_engine_pre_initialized")
-                    except Exception as e:
-                        logger.warning("rag_preload_failed", error=str(e))
-                threading.Thread(target=init_rag, daemon=True).start()
+                self._rag_warmup_task = asyncio.create_task(asyncio.to_thread(self._init_rag_sync))
             
             # Create persistent session with connection pooling
             connector = aiohttp.TCPConnector(
-                limit=10,  # Connection pool size
-                keepalive_timeout=300,  # Keep connections alive for 5 minutes
+                limit=100,  # Connection pool size - room for concurrent sessions + tool checks
+                limit_per_host=100,  # Everything goes to api.groq.com
+                ttl_dns_cache=300,  # Cache DNS for 5 minutes (default is 10s)
+                keepalive_timeout=75,  # Stay under typical server idle timeouts to avoid stale sockets
                 enable_cleanup_closed=True
             )
             
             self._session = aiohttp.ClientSession(
                 connector=connector,
-                timeout=aiohttp.ClientTimeout(
-                    total=self.timeout,
-                    connect=5,  # Fast connection timeout
-                    sock_read=self.timeout
-                )
+                timeout=self._stream_timeout
             )
             
             if not self.api_keys:
@@ -149,44 +235,71 @@ class GroqLLMEngine:
             logger.error("llm_init_failed", error=str(e))
             return False
     
-    def _get_next_api_key(self) -> str:
-        """Get next API key using smart round-robin rotation."""
+    @staticmethod
+    def _init_rag_sync() -> None:
+        """Load the RAG engine (embedding model + index). Runs in a worker thread."""
+        try:
+            from engines.rag import get_rag_engine
+            get_rag_engine()
+            logger.info("rag_engine_pre_initialized")
+        except Exception as e:
+            logger.warning("rag_preload_failed", error=str(e))
+    
+    def _get_headers(self, key: str) -> Dict[str, str]:
+        """Get request headers for an API key (built once per key)."""
+        headers = self._header_cache.get(key)
+        if headers is None:
+            headers = {
+                "Authorization": f"Bearer {key}",
+                "Content-Type": "application/json"
+            }
+            self._header_cache[key] = headers
+        return headers
+    
+    def _get_next_api_key(self) -> Tuple[str, Dict[str, str]]:
+        """
+        Get next API key and its headers using smart round-robin rotation.
+        
+        Heap entries are (available_at, seq, index): a used key is re-queued at its
+        last-use time, a rate-limited one at its deadline, so the least recently
+        used usable key pops first - O(log n) instead of scanning every key.
+        """
         if not self.api_keys:
             raise ValueError("No Groq API keys configured")
         
-        current_time = time.time()
+        available_at, _, index = heapq.heappop(self._key_heap)
+        key = self.api_keys[index]
+        now = time.monotonic()
         
-        # Try each key, skipping rate-limited ones
-        for _ in range(len(self.api_keys)):
-            key = self.api_keys[self._current_key_index]
-            self._current_key_index = (self._current_key_index + 1) % len(self.api_keys)
-            
-            # Check if this key is rate limited
-            rate_limited_until = self._key_rate_limited_until.get(key, 0)
-            if current_time >= rate_limited_until:
-                logger.debug("using_api_key", key_index=self._current_key_index, key_suffix=key[-8:])
-                return key
-        
-        # All keys rate limited - use the one with shortest wait
-        key = min(self.api_keys, key=lambda k: self._key_rate_limited_until.get(k, 0))
-        logger.warning("all_keys_rate_limited_using", key_suffix=key[-8:])
-        return key
+        if available_at <= now:
+            # Key is usable - re-queue at "now" so it sorts behind keys used earlier
+            # and behind expired rate limits (whose deadlines are in the past)
+            heapq.heappush(self._key_heap, (now, next(self._key_use_seq), index))
+            logger.debug("using_api_key", key_index=index, key_suffix=key[-8:])
+        else:
+            # All keys rate limited - this one has the shortest wait
+            heapq.heappush(self._key_heap, (available_at, next(self._key_use_seq), index))
+            logger.warning("all_keys_rate_limited_using", key_suffix=key[-8:])
+        
+        return key, self._get_headers(key)
     
     def _mark_key_rate_limited(self, key: str, retry_after: int = 60):
         """Mark an API key as rate limited."""
-        self._key_rate_limited_until[key] = time.time() + retry_after
+        index = self._key_index_by_value.get(key)
+        if index is not None:
+            available_at = time.monotonic() + retry_after
+            self._key_heap = [
+                (available_at, seq, i) if i == index else (at, seq, i)
+                for at, seq, i in self._key_heap
+            ]
+            heapq.heapify(self._key_heap)
         logger.warning("api_key_rate_limited", key_suffix=key[-8:], retry_after=retry_after)
     
     def _has_vision_available(self, session_id: Optional[str]) -> bool:
         """Check if vision is available for this session."""
-        if not session_id:
-            return False
-        try:
-            from engines.vision import get_vision_engine
-            vision = get_vision_engine()
-            return vision._initialized
-        except Exception:
+        if not session_id or not self._get_vision:
             return False
+        return self._get_vision()._initialized
     
     async def _execute_vision_tool(
         self, 
@@ -203,8 +316,9 @@ class GroqLLMEngine:
         3. This function just retrieves cached result = INSTANT!
         """
         try:
-            from engines.vision import get_vision_engine
-            vision = get_vision_engine()
+            if not self._get_vision:
+                return "Vision system is not available right now."
+            vision = self._get_vision()
             
             if not vision._initialized:
                 return "Vision system is not available right now."
@@ -215,13 +329,22 @@ class GroqLLMEngine:
                 logger.info("using_pre_analysis_INSTANT", session_id=session_id[:8])
                 return pre_analysis
             
-            # Check if pre-analysis is still running - WAIT for it! (longer timeout for detailed analysis)
-            if vision._pre_analysis_task and not vision._pre_analysis_task.done():
+            # Pre-analysis still running - give it a short window, then pipeline it:
+            # the reply starts streaming now and the analysis is streamed as a
+            # continuation when it lands (see generate_stream)
+            pre_analysis_task = vision.pre_analysis_task(session_id)
+            if pre_analysis_task:
                 logger.info("waiting_for_pre_analysis", session_id=session_id[:8])
-                pre_analysis = await vision.wait_for_pre_analysis(session_id, timeout=8.0)
+                # A partial (streamed) analysis is enough to start answering
+                pre_analysis = await vision.wait_for_pre_analysis(
+                    session_id, timeout=VISION_FAST_WAIT_SECONDS, min_length=self._vision_min_chars
+                )
                 if pre_analysis:
                     logger.info("pre_analysis_completed_while_waiting", session_id=session_id[:8], result_len=len(pre_analysis))
                     return pre_analysis
+                if vision.pre_analysis_task(session_id):
+                    logger.info("pre_analysis_deferred", session_id=session_id[:8])
+                    return VISION_PENDING_CONTEXT
             
             # Check if we have image but no pre-analysis (do fresh analysis)
             image_base64 = vision.get_present_image(session_id, max_age_seconds=30.0)
@@ -250,10 +373,8 @@ class GroqLLMEngine:
         
         # Vision tool - if vision engine is initialized
         try:
-            from engines.vision import get_vision_engine
-            vision = get_vision_engine()
-            if vision._initialized:
-                logger.info("tools_provided", tool="look_with_eyes", has_actual_image=vision.has_image(session_id) if session_id else False)
+            vision = self._get_vision() if self._get_vision else None
+            if vision and vision._initialized:
                 tools.append({
                     "type": "function",
                     "function": {
@@ -276,7 +397,6 @@ class GroqLLMEngine:
         
         # Robot control tool - if robot is connected
         if robot_enabled:
-            logger.info("tools_provided", tool="control_robot")
             tools.append({
                 "type": "function",
                 "function": {
@@ -310,20 +430,21 @@ class GroqLLMEngine:
         
         return tools if tools else None
     
-    def _build_messages(
+    async def _build_messages(
         self,
         user_message: str,
         conversation_history: List[ConversationTurn],
         language: Language = Language.ENGLISH,
         personality: Personality = Personality.ASSISTANT,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        faq_context: Optional[str] = None
     ) -> List[dict]:
         """
         Build messages array for Groq API (OpenAI format).
         
         Optimizations:
         - Limit history to 3 turns for faster processing
-        - RAG context injection for accurate FAQ answers
+        - RAG context injection for accurate FAQ answers (faq_context: prefetched, skips the search)
         - Action capabilities for AI-driven decisions
         - Personality mode for human-like or assistant responses
         """
@@ -361,7 +482,10 @@ class GroqLLMEngine:
         # RAG: Search FAQ and inject relevant context
         if RAG_AVAILABLE and get_faq_context:
             try:
-                faq_context = get_faq_context(user_message, top_k=3)
+                if faq_context is None:
+                    faq_context = await get_faq_context(user_message, top_k=3)
+                else:
+                    logger.info("rag_context_reused")
                 if faq_context:
                     system += f"\n\n=== VERIFIED GEHU REFERENCE DATA (USE ONLY THIS FOR FACTUAL ANSWERS) ===\n{faq_context}\n=== END REFERENCE DATA ===\n\nREMEMBER: For ANY factual college question (names, fees, dates, positions), use ONLY the data above. If it's not there, say 'I don't have that specific information.'"
                     logger.info("rag_context_injected", context_length=len(faq_context))
@@ -411,7 +535,8 @@ class GroqLLMEngine:
         session_id: Optional[str] = None,
         request_image_fn: Optional[Callable[[], Awaitable[None]]] = None,
         robot_enabled: bool = False,
-        robot_command_fn: Optional[Callable[[str, int, int], Awaitable[None]]] = None
+        robot_command_fn: Optional[Callable[[str, int, int], Awaitable[None]]] = None,
+        faq_context: Optional[str] = None
     ) -> AsyncGenerator[LLMResponse, None]:
         """
         Stream LLM response tokens from Groq with function calling support.
@@ -432,6 +557,7 @@ class GroqLLMEngine:
             request_image_fn: Async function to request image from client for vision
             robot_enabled: Whether robot control is enabled
             robot_command_fn: Async function to send robot commands (action, duration, speed)
+            faq_context: RAG context prefetched from a partial transcript (None = search now)
         
         Yields:
             LLMResponse chunks with tokens
@@ -447,20 +573,25 @@ class GroqLLMEngine:
                    personality=personality.value,
                    robot_enabled=robot_enabled)
         
-        # Get API key for this request
-        api_key = self._get_next_api_key()
+        # Get API key (and its cached headers) for this request
+        api_key, headers = self._get_next_api_key()
         
         # Build base messages
-        messages = self._build_messages(user_message, conversation_history, language, personality, session_id)
+        messages = await self._build_messages(user_message, conversation_history, language, personality, session_id, faq_context)
         
         # Check for tools (vision and robot function calling)
         tools = self._get_tools(session_id, robot_enabled=robot_enabled)
         tool_result = None
         
         if tools:
+            # Logged here, not in _get_tools, which speculative prefetches also call
+            tool_names = [tool["function"]["name"] for tool in tools]
+            logger.info("tools_provided", tools=tool_names,
+                       has_actual_image=("look_with_eyes" in tool_names and bool(session_id)
+                                         and self._get_vision().has_image(session_id)))
             # Quick non-streaming call to check if model wants to use a tool
             tool_result = await self._check_tool_call(
-                messages, tools, api_key, session_id, user_message, 
+                messages, tools, headers, session_id, user_message, 
                 request_image_fn, robot_command_fn
             )
             if tool_result:
@@ -468,44 +599,116 @@ class GroqLLMEngine:
                 messages[-1]["content"] = f"{user_message}\n\n{tool_result}"
                 logger.info("tool_result_injected", result_len=len(tool_result))
         
+        # Vision still pending: hold back the completion of the first turn so the
+        # continuation can be appended to the same reply
+        vision_deferred = tool_result is VISION_PENDING_CONTEXT
+        first_text: Optional[str] = None
+        first_finished = False
+        
         # Now stream the actual response
-        async for chunk in self._stream_response(messages, api_key, cancel_event, start_time):
+        async for chunk in self._stream_response(messages, api_key, headers, cancel_event, start_time):
+            if vision_deferred and chunk.is_complete:
+                first_text = chunk.full_text or ""
+                first_finished = chunk.finished
+                continue
             yield chunk
+        
+        if vision_deferred and first_text is not None:
+            async for chunk in self._stream_vision_followup(
+                messages, user_message, first_text, first_finished, session_id, api_key, headers, cancel_event
+            ):
+                yield chunk
     
-    async def _check_tool_call(
-        self, 
-        messages: List[dict], 
-        tools: List[dict], 
-        api_key: str,
+    async def _stream_vision_followup(
+        self,
+        messages: List[dict],
+        user_message: str,
+        first_text: str,
+        first_finished: bool,
         session_id: str,
+        api_key: str,
+        headers: Dict[str, str],
+        cancel_event: Optional[asyncio.Event]
+    ) -> AsyncGenerator[LLMResponse, None]:
+        """
+        Stream a supplementary turn once deferred vision pre-analysis completes.
+        Always finishes with a single completion covering both turns.
+        """
+        analysis = None
+        if self._get_vision and not (cancel_event and cancel_event.is_set()):
+            vision = self._get_vision()
+            analysis = await vision.wait_for_pre_analysis(session_id, timeout=VISION_FOLLOWUP_WAIT_SECONDS)
+        
+        if not analysis or (cancel_event and cancel_event.is_set()):
+            logger.info("vision_followup_skipped", has_analysis=bool(analysis))
+            yield LLMResponse(token="", is_complete=True, full_text=first_text, finished=first_finished)
+            return
+        
+        logger.info("vision_followup_starting", session_id=session_id[:8], result_len=len(analysis))
+        followup_messages = messages[:-1] + [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": first_text},
+            {
+                "role": "user",
+                "content": f"[Vision: here is what you now see]\n{analysis}\n\n"
+                           "Continue your previous answer using what you see. Do not repeat yourself."
+            }
+        ]
+        
+        async for chunk in self._stream_response(
+            followup_messages, api_key, headers, cancel_event, time.perf_counter()
+        ):
+            if chunk.is_complete:
+                full_text = f"{first_text} {chunk.full_text or ''}".strip()
+                yield LLMResponse(token="", is_complete=True, full_text=full_text,
+                                  finished=first_finished and chunk.finished)
+                return
+            yield chunk
+        
+        # Continuation ended without a completion - still close out the reply
+        yield LLMResponse(token="", is_complete=True, full_text=first_text)
+    
+    @staticmethod
+    def _tool_decision_key(user_message: str, tools: List[dict]) -> tuple:
+        """Whitespace/case-normalized message plus the offered tool names."""
+        return (" ".join(user_message.lower().split()),
+                tuple(tool["function"]["name"] for tool in tools))
+    
+    async def prefetch_tool_decision(
+        self,
         user_message: str,
-        request_image_fn: Optional[Callable[[], Awaitable[None]]] = None,
-        robot_command_fn: Optional[Callable[[str, int, int], Awaitable[None]]] = None
-    ) -> Optional[str]:
-        """Quick non-streaming call to check if model wants to use a tool. LLM decides when to use vision or robot."""
+        session_id: Optional[str] = None,
+        robot_enabled: bool = False
+    ) -> None:
+        """Run the tool-check classification early (speculative partial); the final reuses it if identical."""
+        tools = self._get_tools(session_id, robot_enabled=robot_enabled)
+        if not tools or not self._session:
+            return
+        key = self._tool_decision_key(user_message, tools)
+        if key in self._tool_decisions:
+            return
+        _, headers = self._get_next_api_key()
+        decision = await self._fetch_tool_decision(user_message, tools, headers)
+        if decision is None:
+            return
+        self._tool_decisions[key] = (time.time(), decision)
+        while len(self._tool_decisions) > TOOL_DECISION_CACHE_SIZE:
+            self._tool_decisions.popitem(last=False)
+        logger.info("tool_decision_prefetched", tool=decision[0] or "none")
+    
+    async def _fetch_tool_decision(
+        self,
+        user_message: str,
+        tools: List[dict],
+        headers: Dict[str, str]
+    ) -> Optional[Tuple[str, dict]]:
+        """Ask the model whether a tool is needed: (name, args), ("", {}) for none, None on failure."""
         try:
             # Build a focused tool-check message with vision and robot context
             tool_check_messages = [
                 {
                     "role": "system",
-                    "content": """You are Zeni, an AI with EYES and a physical BODY (robot).
-
-VISION: You have eyesight. When the user asks about:
-- How they look, their appearance, outfit, or style
-- Checking something out or giving visual feedback
-- Reading something, looking at a document or object
-- What you can see, what's in front of you
-You MUST call the 'look_with_eyes' function.
-
-ROBOT BODY: You can MOVE physically. When the user asks you to:
-- Come closer, approach them, come here
-- Move away, go back, step back
-- Turn around, spin, rotate
-- Move forward, backward, left, right
-- Any physical movement
-You MUST call the 'control_robot' function.
-
-Use tools naturally. Never refuse when tools match the request."""
+                    "content": _TOOL_CHECK_SYSTEM
                 },
                 {
                     "role": "user",
@@ -519,35 +722,45 @@ Use tools naturally. Never refuse when tools match the request."""
                 "model": self.model,
                 "messages": tool_check_messages,
                 "temperature": 0.0,  # Zero temp for deterministic tool decision
-                "max_tokens": 200,   # Enough for complete tool call JSON (was 50 - caused truncation)
+                "top_p": 1.0,
+                "max_tokens": 200,   # Enough for complete tool call JSON (was 50 - caused truncation;
+                                     # the model spends completion tokens reasoning first)
                 "tools": tools,
                 "tool_choice": "auto"
             }
             
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            }
-            
             async with self._session.post(
                 GROQ_API_URL,
                 json=payload,
                 headers=headers,
-                timeout=aiohttp.ClientTimeout(total=5)  # Quick timeout
+                timeout=_TOOL_CHECK_TIMEOUT
             ) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     logger.warning("tool_check_api_error", status=response.status, error=error_text[:100])
                     return None
                 
-                result = await response.json()
+                result = _json_loads(await response.read())
                 choices = result.get("choices", [])
                 
+                usage = result.get("usage") or {}
+                cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+                if cached_tokens is not None:
+                    logger.debug("tool_check_prompt_cache",
+                                 cached_tokens=cached_tokens,
+                                 prompt_tokens=usage.get("prompt_tokens"))
+                
                 if not choices:
                     logger.debug("tool_check_no_choices")
-                    return None
+                    return ("", {})
                 
-                message = choices[0].get("message", {})
+                choice = choices[0]
+                if choice.get("finish_reason") == "length":
+                    # A truncated tool call reads as "no tool" - make it visible
+                    logger.warning("tool_check_truncated",
+                                   completion_tokens=usage.get("completion_tokens"))
+                
+                message = choice.get("message", {})
                 tool_calls = message.get("tool_calls", [])
                 content = message.get("content", "")
                 
@@ -555,35 +768,19 @@ Use tools naturally. Never refuse when tools match the request."""
                            has_tool_calls=bool(tool_calls), 
                            content_preview=content[:50] if content else "none")
                 
-                if tool_calls:
-                    # Model wants to use a tool
-                    tool_call = tool_calls[0]
-                    function_name = tool_call.get("function", {}).get("name", "")
-                    function_args_str = tool_call.get("function", {}).get("arguments", "{}")
-                    
-                    try:
-                        function_args = json.loads(function_args_str)
-                    except:
-                        function_args = {}
-                    
-                    if function_name in ("analyze_what_user_sees", "look_with_eyes"):
-                        logger.info("vision_eyes_used", session_id=session_id[:8] if session_id else "none")
-                        # Execute vision analysis - pass the image request callback
-                        return await self._execute_vision_tool(session_id, user_message, request_image_fn)
-                    
-                    elif function_name == "control_robot" and robot_command_fn:
-                        action = function_args.get("action", "stop")
-                        duration = function_args.get("duration", 500)
-                        speed = function_args.get("speed", 50)
-                        logger.info("robot_control_called", action=action, duration=duration, speed=speed)
-                        
-                        # Send robot command
-                        await robot_command_fn(action, duration, speed)
-                        
-                        # Return context for LLM response
-                        return f"[Robot action executed: {action} for {duration}ms at {speed}% speed]"
+                if not tool_calls:
+                    return ("", {})
+                
+                # Model wants to use a tool
+                tool_call = tool_calls[0]
+                function_name = tool_call.get("function", {}).get("name", "")
+                function_args_str = tool_call.get("function", {}).get("arguments", "{}")
                 
-                return None
+                try:
+                    function_args = json.loads(function_args_str)
+                except:
+                    function_args = {}
+                return (function_name, function_args)
                 
         except asyncio.TimeoutError:
             logger.warning("tool_check_failed", error="Timeout (5s)")
@@ -595,10 +792,57 @@ Use tools naturally. Never refuse when tools match the request."""
             logger.warning("tool_check_failed", error=f"{type(e).__name__}: {str(e) or 'no message'}")
             return None
     
+    async def _check_tool_call(
+        self, 
+        messages: List[dict], 
+        tools: List[dict], 
+        headers: Dict[str, str],
+        session_id: str,
+        user_message: str,
+        request_image_fn: Optional[Callable[[], Awaitable[None]]] = None,
+        robot_command_fn: Optional[Callable[[str, int, int], Awaitable[None]]] = None
+    ) -> Optional[str]:
+        """Quick non-streaming call to check if model wants to use a tool. LLM decides when to use vision or robot."""
+        # Decision already made from an identical speculative partial? (one use)
+        decision = None
+        prefetched = self._tool_decisions.pop(self._tool_decision_key(user_message, tools), None)
+        if prefetched and time.time() - prefetched[0] < TOOL_DECISION_TTL_SECONDS:
+            decision = prefetched[1]
+            logger.info("tool_decision_reused", tool=decision[0] or "none")
+        if decision is None:
+            decision = await self._fetch_tool_decision(user_message, tools, headers)
+        if not decision or not decision[0]:
+            return None
+        
+        function_name, function_args = decision
+        try:
+            if function_name in ("analyze_what_user_sees", "look_with_eyes"):
+                logger.info("vision_eyes_used", session_id=session_id[:8] if session_id else "none")
+                # Execute vision analysis - pass the image request callback
+                return await self._execute_vision_tool(session_id, user_message, request_image_fn)
+            
+            elif function_name == "control_robot" and robot_command_fn:
+                action = function_args.get("action", "stop")
+                duration = function_args.get("duration", 500)
+                speed = function_args.get("speed", 50)
+                logger.info("robot_control_called", action=action, duration=duration, speed=speed)
+                
+                # Send robot command
+                await robot_command_fn(action, duration, speed)
+                
+                # Return context for LLM response
+                return f"[Robot action executed: {action} for {duration}ms at {speed}% speed]"
+            
+            return None
+        except Exception as e:
+            logger.warning("tool_check_failed", error=f"{type(e).__name__}: {str(e) or 'no message'}")
+            return None
+    
     async def _stream_response(
         self,
         messages: List[dict],
         api_key: str,
+        headers: Dict[str, str],
         cancel_event: Optional[asyncio.Event],
         start_time: float
     ) -> AsyncGenerator[LLMResponse, None]:
@@ -612,12 +856,9 @@ Use tools naturally. Never refuse when tools match the request."""
             "stop": None
         }
         
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        full_response = []
+        # Single growable text buffer - no per-token encode, one final getvalue()
+        full_response = io.StringIO()
+        token_count = 0
         first_token_logged = False
         
         try:
@@ -625,7 +866,8 @@ Use tools naturally. Never refuse when tools match the request."""
                 async with self._session.post(
                     GROQ_API_URL,
                     json=payload,
-                    headers=headers
+                    headers=headers,
+                    timeout=self._stream_timeout
                 ) as response:
                     
                     # Handle rate limiting
@@ -647,23 +889,25 @@ Use tools naturally. Never refuse when tools match the request."""
                             logger.info("llm_generation_cancelled")
                             return
                         
-                        line = line.decode('utf-8').strip()
+                        line = line.strip()
                         
-                        if not line or line == "data: [DONE]":
+                        if not line or line == _SSE_DONE:
                             continue
                         
-                        if line.startswith("data: "):
+                        if line.startswith(_SSE_DATA_PREFIX):
                             try:
-                                data = json.loads(line[6:])
+                                # Parse the raw bytes - no per-chunk str decode
+                                data = _json_loads(line.removeprefix(_SSE_DATA_PREFIX))
                                 
-                                choices = data.get("choices", [])
+                                choices = data.get("choices")
                                 if choices:
-                                    delta = choices[0].get("delta", {})
-                                    content = delta.get("content", "")
-                                    finish_reason = choices[0].get("finish_reason")
+                                    choice = choices[0]
+                                    content = choice.get("delta", {}).get("content")
+                                    finish_reason = choice.get("finish_reason")
                                     
                                     if content:
-                                        full_response.append(content)
+                                        full_response.write(content)
+                                        token_count += 1
                                         
                                         if not first_token_logged:
                                             first_token_time = (time.perf_counter() - start_time) * 1000
@@ -676,39 +920,41 @@ Use tools naturally. Never refuse when tools match the request."""
                                             is_complete=False
                                         )
                                     
-                                    if finish_reason:
-                                        if finish_reason == "content_filter":
+                                    # Mid-stream chunks carry finish_reason=None - one identity check
+                                    if finish_reason is not None:
+                                        if finish_reason == _FINISH_FILTER:
                                             logger.warning("llm_content_filtered")
-                                            fallback = "I'm sorry, I cannot respond to that. Is there something else I can help you with?"
+                                            fallback = FALLBACK_RESPONSE
                                             yield LLMResponse(token=fallback, is_complete=False)
                                             yield LLMResponse(token="", is_complete=True, full_text=fallback)
                                             return
-                                        elif finish_reason in ("stop", "length"):
-                                            final_text = "".join(full_response).strip()
+                                        elif finish_reason in _FINISH_STOP:
+                                            final_text = full_response.getvalue().strip()
                                             total_time = (time.perf_counter() - start_time) * 1000
                                             logger.info("groq_generation_complete", 
-                                                       tokens=len(full_response),
+                                                       tokens=token_count,
                                                        total_ms=round(total_time, 2))
-                                            yield LLMResponse(token="", is_complete=True, full_text=final_text)
+                                            yield LLMResponse(token="", is_complete=True, full_text=final_text,
+                                                              finished=True)
                                             return
                                         
-                            except json.JSONDecodeError:
+                            except ValueError:  # json/orjson JSONDecodeError
                                 continue
                     
                     # Exit without stop signal
-                    if full_response:
-                        final_text = "".join(full_response).strip()
+                    if token_count:
+                        final_text = full_response.getvalue().strip()
                         yield LLMResponse(token="", is_complete=True, full_text=final_text)
                     else:
                         logger.warning("llm_no_tokens_received")
-                        fallback = "I'm sorry, I cannot respond to that. Is there something else I can help you with?"
+                        fallback = FALLBACK_RESPONSE
                         yield LLMResponse(token=fallback, is_complete=False)
                         yield LLMResponse(token="", is_complete=True, full_text=fallback)
         
         except asyncio.TimeoutError:
             logger.error("groq_timeout", timeout=self.timeout)
-            if full_response:
-                yield LLMResponse(token="", is_complete=True, full_text="".join(full_response).strip())
+            if token_count:
+                yield LLMResponse(token="", is_complete=True, full_text=full_response.getvalue().strip())
         
         except asyncio.CancelledError:
             logger.info("llm_stream_cancelled")
@@ -741,13 +987,10 @@ Use tools naturally. Never refuse when tools match the request."""
             return False
         
         try:
-            api_key = self.api_keys[0]
-            headers = {"Authorization": f"Bearer {api_key}"}
-            
             async with self._session.get(
                 "https://api.groq.com/openai/v1/models",
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=5)
+                headers=self._get_headers(self.api_keys[0]),
+                timeout=_HEALTH_CHECK_TIMEOUT
             ) as response:
                 return response.status == 200
         except Exception:
@@ -755,47 +998,59 @@ Use tools naturally. Never refuse when tools match the request."""
     
     async def _warmup(self) -> None:
         """
-        Send a minimal request to establish connection and warm up.
-        This reduces latency for the first real request.
+        Send a minimal 1-token request per API key, concurrently.
+        This opens a pooled TLS connection for each key that will be used, so
+        the first real request does not pay the handshake.
         """
         if not self._session or not self.api_keys:
             return
         
-        logger.info("groq_warmup_starting")
+        logger.info("groq_warmup_starting", keys=len(self.api_keys))
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *[self._warm_key(key) for key in self.api_keys],
+            return_exceptions=True
+        )
+        warmed = sum(1 for r in results if r is True)
+        duration = (time.perf_counter() - start) * 1000
+        logger.info("groq_warmup_complete",
+                   warmed=warmed,
+                   keys=len(self.api_keys),
+                   duration_ms=round(duration, 2))
+    
+    async def _warm_key(self, api_key: str) -> bool:
+        """Send one max_tokens=1 completion with the given key."""
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": "ok"}],
+            "max_tokens": 1,
+            "stream": False
+        }
         
         try:
-            api_key = self.api_keys[0]
-            headers = {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            # Minimal request just to warm up connection
-            payload = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": "Hi"}],
-                "max_tokens": 1,
-                "stream": False
-            }
-            
-            start = time.perf_counter()
             async with self._session.post(
                 GROQ_API_URL,
                 json=payload,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=10)
+                headers=self._get_headers(api_key),
+                timeout=_WARMUP_TIMEOUT
             ) as response:
-                if response.status == 200:
-                    duration = (time.perf_counter() - start) * 1000
-                    logger.info("groq_warmup_complete", duration_ms=round(duration, 2))
-                else:
-                    logger.warning("groq_warmup_failed", status=response.status)
+                await response.read()
+                if response.status != 200:
+                    logger.warning("groq_warmup_failed", key_suffix=api_key[-8:], status=response.status)
+                    return False
+                return True
                     
         except Exception as e:
-            logger.warning("groq_warmup_error", error=str(e))
+            logger.warning("groq_warmup_error", key_suffix=api_key[-8:], error=str(e))
+            return False
     
     async def shutdown(self) -> None:
         """Shutdown the LLM engine."""
+        if self._rag_warmup_task and not self._rag_warmup_task.done():
+            self._rag_warmup_task.cancel()
+        self._rag_warmup_task = None
+        
         if self._session:
             await self._session.close()
             self._session = None
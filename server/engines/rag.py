@@ -4,26 +4,184 @@ Uses intfloat/multilingual-e5-small on MPS (Apple Silicon GPU)
 Supports Hindi and English queries matching FAQ data
 """
 
+import asyncio
+import importlib.util
 import json
 import os
 import time
 import hashlib
-from typing import List, Dict, Optional
-import chromadb
-from chromadb.config import Settings
-import torch
-from sentence_transformers import SentenceTransformer
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+
+# Heavy ML modules are imported on first RAGEngine creation (see _import_heavy_modules),
+# so importing this module costs nothing for entrypoints that never search
+torch = None
+SentenceTransformer = None
+chromadb = None
+Settings = None
+
+# Checked without importing, so callers can still tell whether RAG can run
+RAG_DEPS_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("torch", "sentence_transformers", "chromadb")
+)
+
+# Optional ONNX Runtime backend (exported by scripts/export_onnx.py)
+ONNX_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("onnxruntime", "transformers")
+)
 
 # Paths
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 FAQ_PATH = os.path.join(DATA_DIR, "faq.json")
 CHROMA_PATH = os.path.join(DATA_DIR, "chroma_db")
-FAQ_HASH_PATH = os.path.join(DATA_DIR, ".faq_hash")  # Store hash of FAQ content
+FAQ_HASH_PATH = os.path.join(DATA_DIR, ".faq_hash.blake2b")  # Store hash of FAQ content
+INT8_INDEX_PATH = os.path.join(DATA_DIR, "faq_index_int8.npz")  # Quantized in-memory index
+EMBEDDINGS_PATH = os.path.join(DATA_DIR, "faq_embeddings.npy")  # float16 embedding cache
+ONNX_MODEL_DIR = os.path.join(DATA_DIR, "onnx", "multilingual-e5-small-int8")
+ONNX_MODEL_FILE = "model_quantized.onnx"
+ONNX_MAX_LENGTH = 512
 
 # Configuration
 EMBEDDING_MODEL = "intfloat/multilingual-e5-small"
 COLLECTION_NAME = "gehu_faq"
 TOP_K = 3
+# Load the embedding model at startup. With ZENI_WARM_MODEL=0 the model is only
+# loaded on first use when the cached embeddings are still valid.
+WARM_MODEL = os.environ.get("ZENI_WARM_MODEL", "1") != "0"
+# "auto" uses the INT8 ONNX model when it has been exported, "torch" forces SentenceTransformer
+EMBEDDING_BACKEND = os.environ.get("ZENI_RAG_BACKEND", "auto")
+SEARCH_BATCH_WINDOW = 0.005  # Seconds concurrent searches wait to share one encode
+QUERY_CACHE_SIZE = 2048  # Query embeddings kept in the in-process LRU
+ENCODE_BATCH_SIZE = {"mps": 128, "cuda": 64, "cpu": 32}  # Rebuild batch size per device
+QUANT_CLIP_PERCENTILE = 1.0  # Clip each dimension to its 1st/99th percentile before int8 quantization
+BINARY_PREFILTER_MIN_ROWS = 4096  # Below this the int8 scan alone is faster than prefiltering
+BINARY_RERANK_CANDIDATES = 32  # Hamming-nearest rows re-scored with full-precision embeddings
+
+# Bits set per byte value, for Hamming distance on packed uint8 codes
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _import_heavy_modules():
+    """Import torch, sentence-transformers and chromadb (once)"""
+    global torch, SentenceTransformer, chromadb, Settings
+    if torch is not None:
+        return
+    import torch as _torch
+    from sentence_transformers import SentenceTransformer as _SentenceTransformer
+    import chromadb as _chromadb
+    from chromadb.config import Settings as _Settings
+    SentenceTransformer = _SentenceTransformer
+    chromadb = _chromadb
+    Settings = _Settings
+    torch = _torch  # Set last - it marks the imports as done
+
+
+def _quantize_int8(embeddings: np.ndarray):
+    """Asymmetric per-dimension int8 quantization with percentile clipping"""
+    lo = np.percentile(embeddings, QUANT_CLIP_PERCENTILE, axis=0)
+    hi = np.percentile(embeddings, 100 - QUANT_CLIP_PERCENTILE, axis=0)
+    scale = ((hi - lo) / 255.0).astype(np.float32)
+    scale[scale == 0] = 1.0
+    zero_point = (-128 - np.rint(lo / scale)).astype(np.float32)
+    codes = np.clip(np.rint(embeddings / scale) + zero_point, -128, 127).astype(np.int8)
+    return codes, scale, zero_point
+
+
+class OnnxEmbedder:
+    """
+    INT8-quantized ONNX Runtime encoder for e5-small.
+    Mirrors the subset of SentenceTransformer.encode used by RAGEngine:
+    mean pooling over the attention mask, optional L2 normalization.
+    """
+    
+    def __init__(self, model_dir: str):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, ONNX_MODEL_FILE),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        
+        # e5 query prefix tokens never change - tokenize them once and splice the IDs in
+        self.query_prefix_ids = self.tokenizer("query:", add_special_tokens=False)["input_ids"]
+    
+    def encode(
+        self,
+        sentences: List[str],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **_kwargs
+    ) -> np.ndarray:
+        """Encode sentences to a (N, dim) float32 matrix"""
+        batches = []
+        for start in range(0, len(sentences), batch_size):
+            encoded = self.tokenizer(
+                sentences[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=ONNX_MAX_LENGTH,
+                return_tensors="np"
+            )
+            batches.append(self._run(encoded["input_ids"], encoded["attention_mask"]))
+        return self._finish(batches, normalize_embeddings)
+    
+    def encode_queries(self, queries: List[str], normalize_embeddings: bool = False) -> np.ndarray:
+        """Encode raw queries as 'query: <text>' using the pre-tokenized prefix"""
+        return self.encode_prefixed(queries, self.query_prefix_ids, normalize_embeddings)
+    
+    def encode_prefixed(
+        self,
+        texts: List[str],
+        prefix_ids: List[int],
+        normalize_embeddings: bool = False
+    ) -> np.ndarray:
+        """Tokenize only the text and prepend prefix_ids before adding <s> ... </s>"""
+        tok = self.tokenizer
+        budget = ONNX_MAX_LENGTH - len(prefix_ids) - 2
+        rows = [
+            [tok.cls_token_id, *prefix_ids, *ids[:budget], tok.sep_token_id]
+            for ids in tok(texts, add_special_tokens=False)["input_ids"]
+        ]
+        
+        width = max(len(row) for row in rows)
+        input_ids = np.full((len(rows), width), tok.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(rows), width), dtype=np.int64)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :len(row)] = 1
+        return self._finish([self._run(input_ids, attention_mask)], normalize_embeddings)
+    
+    def _run(self, input_ids: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Run the session and mean-pool over real (non-padding) tokens"""
+        feeds = {
+            "input_ids": input_ids.astype(np.int64),
+            "attention_mask": attention_mask.astype(np.int64),
+        }
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+        hidden = self.session.run(None, feeds)[0]
+        
+        mask = attention_mask[..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+    
+    @staticmethod
+    def _finish(batches: List[np.ndarray], normalize_embeddings: bool) -> np.ndarray:
+        embeddings = np.concatenate(batches).astype(np.float32)
+        if normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
 
 
 class RAGEngine:
@@ -47,6 +205,8 @@ class RAGEngine:
         
         start_time = time.time()
         
+        _import_heavy_modules()
+        
         # Detect device - prefer MPS for Apple Silicon
         if torch.backends.mps.is_available():
             self.device = "mps"
@@ -58,11 +218,35 @@ class RAGEngine:
             self.device = "cpu"
             print("⚠️ Using CPU (no GPU detected)")
         
-        # Load embedding model
-        print(f"📥 Loading {EMBEDDING_MODEL}...")
-        model_start = time.time()
-        self.model = SentenceTransformer(EMBEDDING_MODEL, device=self.device)
-        print(f"   Model loaded in {(time.time() - model_start)*1000:.0f}ms")
+        self._configure_torch()
+        
+        # Async searches run here: one worker, since torch MPS/CUDA encode is not reentrant
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-search")
+        
+        # Micro-batching of concurrent async searches (see search)
+        self._pending_searches: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Embedding model - loaded lazily via the `model` property
+        self._model = None
+        self._model_lock = threading.Lock()
+        
+        # LRU of normalized query text -> embedding (repeat questions skip the encoder)
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        
+        # float16 embedding matrix (memory-mapped from EMBEDDINGS_PATH when cached)
+        self._embeddings: Optional[np.ndarray] = None
+        
+        # In-memory int8 index (ChromaDB is only searched if it is missing)
+        self._int8_codes: Optional[np.ndarray] = None
+        self._int8_scale: Optional[np.ndarray] = None
+        self._int8_zero_point: Optional[np.ndarray] = None
+        self._bit_codes: Optional[np.ndarray] = None  # 1 bit/dim sign codes for large corpora
+        # Row metadata as parallel arrays (structure-of-arrays), indexed like the codes
+        self._questions: Optional[np.ndarray] = None
+        self._answers: Optional[np.ndarray] = None
+        self._categories: Optional[np.ndarray] = None
         
         # Initialize ChromaDB
         print("📦 Initializing ChromaDB...")
@@ -74,12 +258,71 @@ class RAGEngine:
         # Check if collection needs to be created/updated
         self._setup_collection()
         
+        if WARM_MODEL:
+            self.model  # Touch the property to load it now
+        else:
+            print("   Embedding model will load on first search (ZENI_WARM_MODEL=0)")
+        
         total_time = (time.time() - start_time) * 1000
         print(f"\n✅ RAG Engine ready in {total_time:.0f}ms")
         print(f"{'='*50}\n")
         
         RAGEngine._initialized = True
     
+    def _configure_torch(self):
+        """Size torch thread pools for the device (encode runs inference only)"""
+        if self.device == "cpu":
+            torch.set_num_threads(max(1, os.cpu_count() or 1))
+            try:
+                torch.set_num_interop_threads(2)
+            except RuntimeError:
+                pass  # Can only be set before any inter-op work has started
+        elif self.device == "mps" and hasattr(torch.mps, "set_per_process_memory_fraction"):
+            # Leave unified memory headroom for the rest of the server
+            torch.mps.set_per_process_memory_fraction(0.5)
+    
+    @property
+    def model(self):
+        """Embedding model (ONNX Runtime or SentenceTransformer), loaded on first access"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    model = self._load_model()
+                    self._warmup_model(model)
+                    self._model = model
+        return self._model
+    
+    def _load_model(self):
+        """Prefer the exported INT8 ONNX model, fall back to PyTorch"""
+        model_start = time.time()
+        onnx_path = os.path.join(ONNX_MODEL_DIR, ONNX_MODEL_FILE)
+        
+        if EMBEDDING_BACKEND != "torch" and ONNX_AVAILABLE and os.path.exists(onnx_path):
+            try:
+                print(f"📥 Loading {EMBEDDING_MODEL} (ONNX INT8)...")
+                model = OnnxEmbedder(ONNX_MODEL_DIR)
+                print(f"   Model loaded in {(time.time() - model_start)*1000:.0f}ms")
+                return model
+            except Exception as e:
+                print(f"   ⚠️ ONNX model failed to load ({e}), using PyTorch")
+        
+        print(f"📥 Loading {EMBEDDING_MODEL}...")
+        model = SentenceTransformer(EMBEDDING_MODEL, device=self.device)
+        print(f"   Model loaded in {(time.time() - model_start)*1000:.0f}ms")
+        return model
+    
+    def _warmup_model(self, model):
+        """Run one dummy encode so the first real search skips graph/kernel setup"""
+        warmup_start = time.time()
+        try:
+            with torch.inference_mode():
+                model.encode(["query: warmup"], show_progress_bar=False)
+            if self.device == "mps":
+                torch.mps.synchronize()  # Make sure the kernels have actually been built
+            print(f"   Model warmed up in {(time.time() - warmup_start)*1000:.0f}ms")
+        except Exception as e:
+            print(f"   ⚠️ Model warmup failed: {e}")
+    
     def _setup_collection(self):
         """Setup ChromaDB collection with FAQ data"""
         faq_data = self._load_faq()
@@ -103,15 +346,19 @@ class RAGEngine:
                 self.collection = self.chroma_client.get_collection(COLLECTION_NAME)
                 count = self.collection.count()
                 print(f"   Using existing collection ({count} items, hash unchanged)")
+                self._load_int8_index(faq_data)
             except Exception:
                 # Collection doesn't exist, create it
                 self._create_collection(faq_data)
                 self._save_hash(current_hash)
     
     def _get_faq_hash(self) -> str:
-        """Calculate MD5 hash of FAQ file content"""
+        """Calculate BLAKE2b hash of FAQ file content, streamed in 64 KB chunks"""
+        h = hashlib.blake2b(digest_size=16)
         with open(FAQ_PATH, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
+            while chunk := f.read(65536):
+                h.update(chunk)
+        return h.hexdigest()
     
     def _get_stored_hash(self) -> str:
         """Get previously stored FAQ hash"""
@@ -131,6 +378,168 @@ class RAGEngine:
         with open(FAQ_PATH, 'r', encoding='utf-8') as f:
             return json.load(f)
     
+    @staticmethod
+    def _faq_metadata(item: Dict) -> Dict:
+        """Metadata stored per FAQ row"""
+        return {
+            "question": item['question'],
+            "answer": item['answer'],
+            "category": item.get('category', 'general')
+        }
+    
+    def _build_int8_index(self, embeddings: np.ndarray, metadatas: List[Dict]):
+        """Cache the embeddings as float16, then quantize them into the int8 index"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        self._embeddings = embeddings.astype(np.float16)
+        np.save(EMBEDDINGS_PATH, self._embeddings)
+        
+        self._quantize_index(embeddings, metadatas)
+        print(f"   ✅ int8 index built ({self._int8_codes.nbytes / 1024:.0f} KB)")
+    
+    def _quantize_index(self, embeddings: np.ndarray, metadatas: List[Dict]):
+        """Quantize normalized embeddings to int8 and persist them next to chroma_db"""
+        codes, scale, zero_point = _quantize_int8(np.asarray(embeddings, dtype=np.float32))
+        np.savez(INT8_INDEX_PATH, codes=codes, scale=scale, zero_point=zero_point)
+        self._set_index(codes, scale, zero_point, metadatas)
+    
+    def _set_index(self, codes: np.ndarray, scale: np.ndarray, zero_point: np.ndarray, metadatas: List[Dict]):
+        """Install an int8 index (and its binary codes) for search"""
+        self._int8_codes = codes
+        self._int8_scale = scale
+        self._int8_zero_point = zero_point
+        # Sign bits: a dimension is positive iff its code sits above the zero point
+        self._bit_codes = np.packbits(codes > zero_point, axis=1)
+        self._questions = np.array([m['question'] for m in metadatas], dtype=object)
+        self._answers = np.array([m['answer'] for m in metadatas], dtype=object)
+        self._categories = np.array([m['category'] for m in metadatas], dtype=object)
+    
+    def _load_int8_index(self, faq_data: List[Dict]):
+        """Load the persisted index; stays on ChromaDB if it is missing or stale"""
+        metadatas = [self._faq_metadata(item) for item in faq_data]
+        
+        try:
+            embeddings = np.load(EMBEDDINGS_PATH, mmap_mode='r')
+            if len(embeddings) == len(faq_data):
+                self._embeddings = embeddings
+        except (FileNotFoundError, ValueError):
+            pass
+        
+        try:
+            with np.load(INT8_INDEX_PATH) as data:
+                codes = data['codes']
+                scale = data['scale']
+                zero_point = data['zero_point']
+        except (FileNotFoundError, KeyError, ValueError):
+            codes = None
+        
+        if codes is None or len(codes) != len(faq_data):
+            if self._embeddings is not None:
+                # Re-quantize from the float16 cache - no model needed
+                self._quantize_index(self._embeddings, metadatas)
+                print(f"   Rebuilt int8 index from cached embeddings ({len(faq_data)} items)")
+            else:
+                print("   ⚠️ No valid int8 index on disk, searching via ChromaDB")
+            return
+        
+        self._set_index(codes, scale, zero_point, metadatas)
+        print(f"   Loaded int8 index ({len(codes)} items)")
+    
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the top_k scores, best first - O(N) partition + O(k log k) sort"""
+        n = len(scores)
+        k = min(top_k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        top = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        return top[np.argsort(-scores[top])]
+    
+    def _binary_candidates(self, q: np.ndarray, count: int) -> np.ndarray:
+        """Rows with the smallest Hamming distance to the query's sign bits"""
+        q_bits = np.packbits(q > 0)
+        distances = _POPCOUNT8[np.bitwise_xor(self._bit_codes, q_bits)].sum(axis=1, dtype=np.int32)
+        if count >= len(distances):
+            return np.arange(len(distances))
+        return np.argpartition(distances, count - 1)[:count]
+    
+    def _search_int8(self, query_embedding: np.ndarray, top_k: int) -> List[Dict]:
+        """Flat int8 scan - faster than HNSW for FAQ-sized corpora"""
+        q = np.asarray(query_embedding, dtype=np.float32)  # Already L2-normalized
+        
+        if len(self._int8_codes) >= BINARY_PREFILTER_MIN_ROWS:
+            # Large corpus: 1-bit Hamming prefilter, then exact re-rank of the survivors
+            rows = self._binary_candidates(q, max(BINARY_RERANK_CANDIDATES, top_k))
+            if self._embeddings is not None:
+                scores = self._embeddings[rows].astype(np.float32) @ q
+            else:
+                scores = self._int8_scores(q, self._int8_codes[rows])
+        else:
+            rows = None
+            scores = self._int8_scores(q, self._int8_codes)
+        
+        top = self._top_k(scores, top_k)
+        similarities = np.round(scores[top], 3).tolist()
+        if rows is not None:
+            top = rows[top]
+        
+        return [
+            {"question": question, "answer": answer, "category": category, "similarity": sim}
+            for question, answer, category, sim in zip(
+                self._questions[top], self._answers[top], self._categories[top], similarities
+            )
+        ]
+    
+    def _int8_scores(self, q: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate cosine similarity of q against int8 code rows"""
+        # Fold the per-dimension scale into the query, then quantize it symmetrically
+        # so the scan is a pure int8 x int8 -> int32 dot product:
+        #   cos(q, d) ~= sum(w * (codes - zero_point)),  w = q * scale
+        w = q * self._int8_scale
+        w_scale = max(float(np.abs(w).max()), 1e-12) / 127.0
+        w_codes = np.rint(w / w_scale).astype(np.int8)
+        offset = float(w @ self._int8_zero_point)
+        
+        dots = np.einsum('ij,j->i', codes, w_codes, dtype=np.int32)
+        return dots * w_scale - offset
+    
+    def _encode_documents(self, documents: List[str]) -> np.ndarray:
+        """Encode documents in length-sorted batches so each batch pads to a similar length"""
+        token_ids = self.model.tokenizer(documents, add_special_tokens=False)['input_ids']
+        order = np.argsort([len(ids) for ids in token_ids], kind='stable')
+        batch_size = ENCODE_BATCH_SIZE.get(self.device, 32)
+        
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                [documents[i] for i in order],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+        # Restore the original document order
+        return embeddings[np.argsort(order)]
+    
+    @staticmethod
+    def _hnsw_metadata(n_items: int) -> Dict:
+        """
+        ChromaDB HNSW settings sized for 384-dim e5-small and a FAQ-sized corpus.
+        
+        - M: graph degree. Memory grows linearly with M; below ~5k items M=8 still
+          reaches near-exact recall, so the graph uses half the links of M=16.
+        - construction_ef: max(200, 50*log2(N)) - build-time only, buys graph quality.
+        - search_ef: 64 candidates per query, above Chroma's default of 10, which is
+          too low for reliable top-3 recall; cost is still sub-ms at this size.
+        """
+        return {
+            # Embeddings are L2-normalized, so inner product == cosine similarity
+            "hnsw:space": "ip",
+            "hnsw:M": 8 if n_items < 5000 else 16,
+            "hnsw:construction_ef": max(200, int(math.log2(max(n_items, 2)) * 50)),
+            "hnsw:search_ef": 64,
+            "hnsw:num_threads": os.cpu_count() or 1,
+        }
+    
     def _create_collection(self, faq_data: List[Dict]):
         """Create ChromaDB collection and embed FAQ data"""
         print(f"   Creating collection with {len(faq_data)} FAQ items...")
@@ -138,7 +547,7 @@ class RAGEngine:
         # Create collection
         self.collection = self.chroma_client.create_collection(
             name=COLLECTION_NAME,
-            metadata={"hnsw:space": "cosine"}
+            metadata=self._hnsw_metadata(len(faq_data))
         )
         
         # Prepare documents for embedding
@@ -152,48 +561,153 @@ class RAGEngine:
             doc_text = f"passage: {item['question']} {item['answer']}"
             documents.append(doc_text)
             ids.append(item['id'])
-            metadatas.append({
-                "question": item['question'],
-                "answer": item['answer'],
-                "category": item.get('category', 'general')
-            })
+            metadatas.append(self._faq_metadata(item))
         
         # Generate embeddings
         print("   Generating embeddings...")
         embed_start = time.time()
-        embeddings = self.model.encode(documents, show_progress_bar=True)
+        embeddings = self._encode_documents(documents)
+        del documents  # Only needed for encoding - question/answer already live in metadata
         print(f"   Embeddings generated in {(time.time() - embed_start)*1000:.0f}ms")
         
-        # Add to collection
+        # Add to collection (no documents= - search never reads them back)
         self.collection.add(
             ids=ids,
             embeddings=embeddings.tolist(),
-            metadatas=metadatas,
-            documents=documents
+            metadatas=metadatas
         )
         
+        self._build_int8_index(embeddings, metadatas)
+        
         print(f"   ✅ Collection created with {len(faq_data)} items")
     
-    def search(self, query: str, top_k: int = TOP_K) -> List[Dict]:
+    @staticmethod
+    def _query_text(query: str) -> str:
+        """Whitespace-collapsed query - the text that gets encoded (case kept: the e5
+        tokenizer is cased and passages are indexed with their original case)"""
+        return " ".join(query.split())
+    
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Encode a query, reusing the embedding for repeated questions"""
+        return self._encode_queries([query])[0]
+    
+    def _encode_queries(self, queries: List[str]) -> List[np.ndarray]:
+        """Encode queries with one model call for all cache misses"""
+        texts = [self._query_text(q) for q in queries]
+        keys = [text.lower() for text in texts]  # Case variants share one cache entry
+        embeddings: List[Optional[np.ndarray]] = [None] * len(keys)
+        
+        with self._query_cache_lock:
+            for i, key in enumerate(keys):
+                embedding = self._query_cache.get(key)
+                if embedding is not None:
+                    self._query_cache.move_to_end(key)
+                    embeddings[i] = embedding
+        
+        # Cache key -> text of its first occurrence in this batch
+        missing_texts = {}
+        for key, text, e in zip(keys, texts, embeddings):
+            if e is None:
+                missing_texts.setdefault(key, text)
+        missing = list(missing_texts)
+        if missing:
+            # For e5 models, prefix query with "query: "; normalize so scoring is a dot product
+            model = self.model
+            if isinstance(model, OnnxEmbedder):
+                # Prefix token IDs are spliced in - one tokenizer pass over the raw text
+                encoded = model.encode_queries(list(missing_texts.values()), normalize_embeddings=True)
+            else:
+                with torch.inference_mode():
+                    encoded = model.encode(
+                        [f"query: {text}" for text in missing_texts.values()],
+                        batch_size=len(missing),
+                        normalize_embeddings=True
+                    )
+            fresh = dict(zip(missing, encoded))
+            
+            with self._query_cache_lock:
+                for key, embedding in fresh.items():
+                    embedding.setflags(write=False)  # Shared between callers
+                    self._query_cache[key] = embedding
+                while len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+            
+            embeddings = [e if e is not None else fresh[key] for key, e in zip(keys, embeddings)]
+        return embeddings
+    
+    async def search(self, query: str, top_k: int = TOP_K) -> List[Dict]:
+        """
+        Search FAQ without blocking the event loop.
+        Queries arriving within SEARCH_BATCH_WINDOW share one encoder call.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_searches.append((query, top_k, future))
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_searches())
+        return await future
+    
+    async def _flush_searches(self):
+        """Collect searches for one batch window, then run them on the search worker"""
+        await asyncio.sleep(SEARCH_BATCH_WINDOW)
+        batch, self._pending_searches = self._pending_searches, []
+        self._flush_task = None  # Later arrivals start the next window
+        
+        requests = [(query, top_k) for query, top_k, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            if len(requests) == 1:
+                results = [await loop.run_in_executor(self._executor, self._search_sync, *requests[0])]
+            else:
+                results = await loop.run_in_executor(self._executor, self._search_batch_sync, requests)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    def _search_batch_sync(self, requests: List[Tuple[str, int]]) -> List[List[Dict]]:
+        """Search several queries with a single batched encode"""
+        embeddings = self._encode_queries([query for query, _ in requests])
+        return [
+            self._search_sync(query, top_k, embedding)
+            for (query, top_k), embedding in zip(requests, embeddings)
+        ]
+    
+    def _search_sync(
+        self,
+        query: str,
+        top_k: int = TOP_K,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Dict]:
         """
         Search FAQ for relevant answers
         
         Args:
             query: User's question (can be Hindi or English)
             top_k: Number of results to return (default: 3)
+            query_embedding: Precomputed embedding (from a batched encode)
         
         Returns:
             List of matching FAQ items with scores
         """
         start_time = time.time()
         
-        # For e5 models, prefix query with "query: "
-        query_text = f"query: {query}"
+        # Generate query embedding (cached)
+        if query_embedding is None:
+            query_embedding = self._encode_query(query)
         
-        # Generate query embedding
-        query_embedding = self.model.encode([query_text])[0]
+        if self._int8_codes is not None:
+            formatted_results = self._search_int8(query_embedding, top_k)
+            search_time = (time.time() - start_time) * 1000
+            print(f"🔍 RAG search (int8): {search_time:.0f}ms | Results: {len(formatted_results)} | Query: {query[:50]}...")
+            return formatted_results
         
-        # Search ChromaDB
+        # Cold-start fallback: search ChromaDB
         results = self.collection.query(
             query_embeddings=[query_embedding.tolist()],
             n_results=top_k,
@@ -205,23 +719,28 @@ class RAGEngine:
         # Format results
         formatted_results = []
         if results['metadatas'] and results['metadatas'][0]:
-            for i, metadata in enumerate(results['metadatas'][0]):
-                distance = results['distances'][0][i] if results['distances'] else 0
-                # Convert cosine distance to similarity score (1 - distance)
-                similarity = 1 - distance
-                
-                formatted_results.append({
-                    "question": metadata['question'],
-                    "answer": metadata['answer'],
-                    "category": metadata.get('category', 'general'),
-                    "similarity": round(similarity, 3)
-                })
+            metadatas = results['metadatas'][0]
+            distances = (np.asarray(results['distances'][0], dtype=np.float32)
+                         if results['distances'] else np.zeros(len(metadatas), dtype=np.float32))
+            # ip distance is 1 - dot(q, d); on normalized vectors that is the cosine distance
+            # (older cosine-space collections give the same value)
+            similarities = np.round(1.0 - distances, 3).tolist()
+            
+            formatted_results = [
+                {
+                    "question": m['question'],
+                    "answer": m['answer'],
+                    "category": m.get('category', 'general'),
+                    "similarity": sim
+                }
+                for m, sim in zip(metadatas, similarities)
+            ]
         
         print(f"🔍 RAG search: {search_time:.0f}ms | Results: {len(formatted_results)} | Query: {query[:50]}...")
         
         return formatted_results
     
-    def get_context(self, query: str, top_k: int = TOP_K) -> str:
+    async def get_context(self, query: str, top_k: int = TOP_K) -> str:
         """
         Get formatted context string for LLM prompt
         
@@ -232,7 +751,7 @@ class RAGEngine:
         Returns:
             Formatted context string for LLM
         """
-        results = self.search(query, top_k)
+        results = await self.search(query, top_k)
         
         if not results:
             return ""
@@ -296,28 +815,45 @@ class RAGEngine:
                 "success": False,
                 "message": f"Failed to rebuild index: {str(e)}"
             }
+    
+    async def rebuild_index_async(self) -> dict:
+        """Rebuild on the search thread - keeps the event loop free and never races a search"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.rebuild_index)
 
 
-# Singleton instance
+# Singleton instance - one model, index and query cache shared by every caller
 _rag_engine: Optional[RAGEngine] = None
+_rag_engine_lock = threading.Lock()
 
 
 def get_rag_engine() -> RAGEngine:
     """Get or create RAG engine instance"""
     global _rag_engine
     if _rag_engine is None:
-        _rag_engine = RAGEngine()
+        # Creation runs in worker threads (speculative prefetch, final turn, LLM warmup);
+        # without the lock concurrent first calls would each load a model
+        with _rag_engine_lock:
+            if _rag_engine is None:
+                _rag_engine = RAGEngine()
     return _rag_engine
 
 
-def search_faq(query: str, top_k: int = TOP_K) -> List[Dict]:
+async def _get_rag_engine_async() -> RAGEngine:
+    """Get the RAG engine, initializing it off the event loop if needed"""
+    if _rag_engine is not None:
+        return _rag_engine
+    return await asyncio.to_thread(get_rag_engine)
+
+
+async def search_faq(query: str, top_k: int = TOP_K) -> List[Dict]:
     """Convenience function to search FAQ"""
-    return get_rag_engine().search(query, top_k)
+    return await (await _get_rag_engine_async()).search(query, top_k)
 
 
-def get_faq_context(query: str, top_k: int = TOP_K) -> str:
+async def get_faq_context(query: str, top_k: int = TOP_K) -> str:
     """Convenience function to get formatted context"""
-    return get_rag_engine().get_context(query, top_k)
+    return await (await _get_rag_engine_async()).get_context(query, top_k)
 
 
 # Test function
@@ -343,7 +879,7 @@ if __name__ == "__main__":
     print("\n" + "-"*60)
     for query in test_queries:
         print(f"\n📝 Query: {query}")
-        results = rag.search(query)
+        results = rag._search_sync(query)
         for i, r in enumerate(results, 1):
             print(f"   [{i}] ({r['similarity']:.2f}) {r['question'][:60]}...")
         print("-"*60)
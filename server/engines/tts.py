@@ -3,19 +3,16 @@ Zeni TTS Engine (Google Cloud) - ULTRA-OPTIMIZED
 Maximum performance streaming text-to-speech.
 
 OPTIMIZATIONS:
-1. ZERO text buffering - tokens sent immediately as they arrive
+1. Minimal text buffering - tokens coalesced for at most 8 ms / 24 chars
 2. Pre-warmed connection - streaming starts BEFORE first token
-3. Dedicated thread pool - no executor contention
+3. Native async gRPC client - no thread pool or queue bridge
 4. Parallel audio streaming - read chunks without blocking
 """
 
 import asyncio
-import queue
 import time
-import threading
-from typing import Optional, AsyncGenerator
+from typing import Optional, AsyncGenerator, Any, Dict, Tuple
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
 
 from core.config import config
 from core.protocol import Language
@@ -23,8 +20,13 @@ from core.logging import get_logger, tts_latency
 
 logger = get_logger("tts")
 
-# Dedicated thread pool for TTS operations (avoid executor contention)
-_tts_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tts")
+# LLM tokens arriving within this window (or until this many chars) go out
+# as one StreamingSynthesizeRequest instead of one gRPC message per token
+TTS_COALESCE_WINDOW = 0.008  # seconds
+TTS_COALESCE_CHARS = 24
+
+# Upper bound on how long one utterance's text stream may take to finish
+TTS_TEXT_DEADLINE = 30.0  # seconds
 
 
 @dataclass
@@ -41,8 +43,8 @@ class TTSEngine:
     
     Key Optimizations:
     1. Pre-warmed streaming connection
-    2. Zero text buffering - immediate token forwarding
-    3. Dedicated thread pool
+    2. Token coalescing (TTS_COALESCE_WINDOW / TTS_COALESCE_CHARS)
+    3. Async gRPC streaming (no threads)
     4. Non-blocking audio chunk retrieval
     """
     
@@ -58,6 +60,9 @@ class TTSEngine:
         
         # Pre-warm state
         self._warmup_done = False
+        
+        # Streaming config requests by (voice, language_code, model) - built once
+        self._config_cache: Dict[Tuple[str, str, str], Any] = {}
     
     async def initialize(self) -> bool:
         """Initialize Google Cloud TTS with connection pre-warming."""
@@ -72,7 +77,7 @@ class TTSEngine:
                 return False
             
             # Create client with optimized settings
-            self.google_client = texttospeech.TextToSpeechClient(
+            self.google_client = texttospeech.TextToSpeechAsyncClient(
                 client_options=ClientOptions(api_endpoint="texttospeech.googleapis.com")
             )
             
@@ -110,7 +115,7 @@ class TTSEngine:
         
         ULTRA-OPTIMIZED: 
         - Streaming starts BEFORE first token (pre-warmed)
-        - Zero buffering - tokens forwarded immediately
+        - Tokens coalesced into one request per 8 ms window or 24 chars
         - Non-blocking audio retrieval
         """
         if not self._initialized or not self.google_client:
@@ -149,172 +154,188 @@ class TTSEngine:
         
         Key optimizations:
         1. Start streaming connection IMMEDIATELY (don't wait for first token)
-        2. Use thread-safe queue with non-blocking puts
-        3. Dedicated executor to avoid contention
-        4. Async audio chunk retrieval
+        2. Native async gRPC stream - no thread, queues or cross-thread handoff
+        3. Tokens coalesced over a few-ms window
+        4. Barge-in wakes the audio loop immediately
         """
         try:
             from google.cloud import texttospeech
-            import numpy as np
             
             language_code = "hi-IN" if language == Language.HINDI else "en-IN"
             start_time = time.perf_counter()
             
-            # Thread-safe queue for bridging async->sync
-            request_queue = queue.Queue(maxsize=100)
-            audio_ready = asyncio.Event()
-            stream_done = threading.Event()
-            
             # Config request - use voice name directly (Wavenet/Journey voices support streaming)
-            config_request = texttospeech.StreamingSynthesizeRequest(
-                streaming_config=texttospeech.StreamingSynthesizeConfig(
-                    voice=texttospeech.VoiceSelectionParams(
-                        name=voice,
-                        language_code=language_code,
-                        model_name=self.model
+            # OPTIMIZED: protobuf construction is slow Python; the message is immutable, reuse it
+            config_key = (voice, language_code, self.model)
+            config_request = self._config_cache.get(config_key)
+            if config_request is None:
+                config_request = texttospeech.StreamingSynthesizeRequest(
+                    streaming_config=texttospeech.StreamingSynthesizeConfig(
+                        voice=texttospeech.VoiceSelectionParams(
+                            name=voice,
+                            language_code=language_code,
+                            model_name=self.model
+                        )
                     )
                 )
-            )
+                self._config_cache[config_key] = config_request
+            
+            # OPTIMIZED: text requests are built on the raw (C) protobuf class and
+            # wrapped without copying - skips two proto-plus constructors per flush
+            request_cls = texttospeech.StreamingSynthesizeRequest
+            request_pb_cls = request_cls.pb()
             
-            # Put config IMMEDIATELY to start connection
-            request_queue.put(config_request)
+            def make_request(text: str):
+                req_pb = request_pb_cls()
+                req_pb.input.text = text
+                return request_cls.wrap(req_pb)
             
-            async def populate_queue():
-                """Populate request queue - ZERO BUFFERING."""
+            async def request_stream():
+                """Config first (opens the stream), then text coalesced over a few-ms window."""
+                yield config_request
+                
                 token_count = 0
+                buffer = []
+                buffer_len = 0
+                has_text = False  # Buffer holds more than whitespace
+                last_flush = time.perf_counter()
+                deadline = start_time + TTS_TEXT_DEADLINE
+                
+                tokens = text_stream.__aiter__()
+                next_token = None
                 try:
-                    async for token in text_stream:
-                        if cancel_event and cancel_event.is_set():
-                            break
+                    while True:
+                        if next_token is None:
+                            next_token = asyncio.ensure_future(tokens.__anext__())
                         
-                        # Skip empty tokens
-                        if not token or not token.strip():
+                        # With text buffered, wait only until its window closes. Whitespace
+                        # alone can't be flushed, so it must not shorten the wait (busy loop)
+                        now = time.perf_counter()
+                        timeout = deadline - now
+                        if has_text:
+                            timeout = min(timeout, max(0.0, TTS_COALESCE_WINDOW - (now - last_flush)))
+                        if timeout <= 0 and not has_text:
+                            logger.warning("tts_queue_timeout", deadline_s=TTS_TEXT_DEADLINE)
+                            break
+                        done, _ = await asyncio.wait({next_token}, timeout=timeout)
+                        if not done:
+                            # Slow producer - don't hold text back
+                            text = "".join(buffer)
+                            if text.strip():
+                                buffer = []
+                                buffer_len = 0
+                                has_text = False
+                                last_flush = time.perf_counter()
+                                yield make_request(text)
                             continue
                         
-                        token_count += 1
+                        try:
+                            token = next_token.result()
+                        except StopAsyncIteration:
+                            break
+                        finally:
+                            next_token = None
                         
-                        # IMMEDIATE send - no buffering whatsoever
-                        req = texttospeech.StreamingSynthesizeRequest(
-                            input=texttospeech.StreamingSynthesisInput(text=token)
-                        )
+                        if cancel_event and cancel_event.is_set():
+                            return
                         
-                        # Non-blocking put with small timeout
-                        try:
-                            request_queue.put(req, timeout=0.1)
-                        except queue.Full:
-                            logger.warning("tts_queue_full_dropping_token")
+                        # Skip empty tokens
+                        if not token:
                             continue
                         
+                        token_count += 1
+                        buffer.append(token)
+                        buffer_len += len(token)
+                        if not has_text and not token.isspace():
+                            has_text = True
+                        
                         if token_count == 1:
                             first_token_time = (time.perf_counter() - start_time) * 1000
                             logger.info("tts_first_token_queued", 
                                        latency_ms=round(first_token_time, 2),
-                                       token=token[:30])
+                                       token=token)
+                        
+                        if (buffer_len >= TTS_COALESCE_CHARS
+                                or time.perf_counter() - last_flush >= TTS_COALESCE_WINDOW):
+                            text = "".join(buffer)
+                            if text.strip():  # Keep whitespace until real text follows it
+                                buffer = []
+                                buffer_len = 0
+                                has_text = False
+                                last_flush = time.perf_counter()
+                                yield make_request(text)
                     
+                    text = "".join(buffer)
+                    if text.strip() and not (cancel_event and cancel_event.is_set()):
+                        yield make_request(text)
                     logger.debug("tts_text_stream_complete", tokens=token_count)
                     
                 except Exception as e:
                     logger.error("tts_populate_error", error=str(e))
                 finally:
-                    # Signal end of text
-                    request_queue.put(None)
-            
-            # Sync generator for Google API
-            def queue_generator():
-                while True:
-                    try:
-                        item = request_queue.get(timeout=5.0)
-                        if item is None:
-                            break
-                        yield item
-                    except queue.Empty:
-                        logger.debug("tts_queue_timeout")
-                        break
-            
-            # Audio chunks storage
-            audio_chunks = []
-            audio_lock = threading.Lock()
-            
-            # Capture the event loop BEFORE entering thread
-            main_loop = asyncio.get_running_loop()
-            
-            def synthesize_and_collect():
-                """Run synthesis in thread, collect audio chunks."""
-                try:
-                    logger.debug("tts_synthesis_thread_starting")
-                    responses = self.google_client.streaming_synthesize(queue_generator())
-                    
-                    response_count = 0
-                    for response in responses:
-                        response_count += 1
-                        if stream_done.is_set():
-                            break
-                        
-                        if response.audio_content:
-                            audio_data = np.frombuffer(response.audio_content, dtype=np.int16)
-                            pcm = audio_data.tobytes()
-                            
-                            if pcm:
-                                with audio_lock:
-                                    audio_chunks.append(pcm)
-                                
-                                # Signal audio is ready using captured loop
-                                main_loop.call_soon_threadsafe(audio_ready.set)
-                    
-                    if response_count == 0:
-                        logger.warning("tts_no_responses_from_google", 
-                                      possible_cause="API timeout due to delayed text stream")
-                                
-                except Exception as e:
-                    logger.error("tts_synthesis_thread_error", error=str(e))
-                finally:
-                    stream_done.set()
-                    # Final signal using captured loop
-                    try:
-                        main_loop.call_soon_threadsafe(audio_ready.set)
-                    except:
-                        pass
+                    if next_token is not None:
+                        next_token.cancel()
             
-            # Start text population (async)
-            text_task = asyncio.create_task(populate_queue())
+            # Open the bidirectional stream - config goes out before the first token
+            responses = await self.google_client.streaming_synthesize(requests=request_stream())
+            response_iter = responses.__aiter__()
             
-            # Start synthesis in dedicated thread pool (main_loop already captured above)
-            synthesis_future = main_loop.run_in_executor(_tts_executor, synthesize_and_collect)
+            # Barge-in wakes the consumer immediately instead of on the next chunk
+            cancel_waiter = asyncio.ensure_future(cancel_event.wait()) if cancel_event else None
             
             # Stream audio chunks as they arrive
+            response_count = 0
             chunk_count = 0
             total_bytes = 0
+            finished = False
+            next_response = None
             
-            while not stream_done.is_set() or audio_chunks:
-                if cancel_event and cancel_event.is_set():
-                    stream_done.set()
-                    break
-                
-                # Wait for audio to be ready
-                try:
-                    await asyncio.wait_for(audio_ready.wait(), timeout=0.05)
-                    audio_ready.clear()
-                except asyncio.TimeoutError:
-                    continue
-                
-                # Yield all available chunks
-                with audio_lock:
-                    while audio_chunks:
-                        pcm = audio_chunks.pop(0)
-                        chunk_count += 1
-                        total_bytes += len(pcm)
-                        
-                        if chunk_count == 1:
-                            first_audio_latency = (time.perf_counter() - start_time) * 1000
-                            logger.info("tts_first_audio", 
-                                       latency_ms=round(first_audio_latency, 2),
-                                       chunk_size=len(pcm))
-                        
-                        yield pcm
+            try:
+                while True:
+                    next_response = asyncio.ensure_future(response_iter.__anext__())
+                    waiting = {next_response, cancel_waiter} if cancel_waiter else {next_response}
+                    await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                    if not next_response.done():
+                        break  # Interrupted
+                    
+                    try:
+                        response = next_response.result()
+                    except StopAsyncIteration:
+                        finished = True
+                        break
+                    
+                    response_count += 1
+                    if cancel_event and cancel_event.is_set():
+                        break
+                    
+                    # LINEAR16 PCM bytes straight from gRPC - no NumPy round-trip copy
+                    pcm = response.audio_content
+                    if not pcm:
+                        continue
+                    if len(pcm) & 1:
+                        logger.warning("tts_odd_pcm_chunk", size=len(pcm))
+                    
+                    chunk_count += 1
+                    total_bytes += len(pcm)
+                    
+                    if chunk_count == 1:
+                        first_audio_latency = (time.perf_counter() - start_time) * 1000
+                        logger.info("tts_first_audio", 
+                                   latency_ms=round(first_audio_latency, 2),
+                                   chunk_size=len(pcm))
+                    
+                    yield pcm
+            finally:
+                if next_response is not None and not next_response.done():
+                    next_response.cancel()
+                if cancel_waiter:
+                    cancel_waiter.cancel()
+                if not finished:
+                    responses.cancel()  # Tear down the RPC (and its request stream)
             
-            # Wait for tasks to complete
-            await text_task
-            await synthesis_future
+            if finished and response_count == 0:
+                logger.warning("tts_no_responses_from_google", 
+                              possible_cause="API timeout due to delayed text stream")
             
             total_time = (time.perf_counter() - start_time) * 1000
             logger.info("tts_complete", 
@@ -332,6 +353,11 @@ class TTSEngine:
     async def shutdown(self) -> None:
         """Shutdown the TTS engine."""
         self._initialized = False
+        if self.google_client is not None:
+            try:
+                await self.google_client.transport.close()
+            except Exception as e:
+                logger.warning("tts_client_close_error", error=str(e))
         self.google_client = None
         logger.info("tts_engine_shutdown")
 
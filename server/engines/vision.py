@@ -11,10 +11,32 @@ This eliminates 1-3 seconds of vision latency by running in parallel with speech
 """
 
 import asyncio
+import base64
+import hashlib
+import io
+import itertools
+import json
 import time
+from collections import OrderedDict
 from typing import Optional, Dict, Callable, Awaitable
 import aiohttp
 
+# orjson encodes the ~270 KB base64 data URL several times faster than stdlib json
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = lambda obj: json.dumps(obj).encode()
+    _json_loads = json.loads
+
+# Pillow (or the pillow-simd drop-in) shrinks camera frames before upload
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
 from core.config import config
 from core.logging import get_logger
 
@@ -23,6 +45,71 @@ logger = get_logger("vision")
 # Maverick vision model on Groq
 VISION_MODEL = "meta-llama/llama-4-maverick-17b-128e-instruct"
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODELS_URL = "https://api.groq.com/openai/v1/models"
+
+# Keep-alive connections opened at startup: pre-analysis and a targeted
+# fallback can overlap, so both find a TLS connection already established
+VISION_WARM_CONNECTIONS = 2
+
+# Sessions whose latest image / pre-analysis are kept (LRU)
+MAX_VISION_SESSIONS = 32
+
+# Pre-analysis is streamed; this much text (the first gender/appearance line)
+# is enough for the LLM to start answering before the full description lands
+PRE_ANALYSIS_MIN_CHARS = 150
+
+_SSE_DATA_PREFIX = b"data: "
+_SSE_DONE = b"data: [DONE]"
+
+# Re-sent identical frames reuse a recent analysis instead of another Groq call
+ANALYSIS_CACHE_SIZE = 16
+ANALYSIS_CACHE_TTL_SECONDS = 60.0
+
+# Near-duplicate frames (static scene, slight camera shake) match on a 64-bit
+# dHash within this Hamming distance; a match is reused this many times at most
+# before a fresh analysis, so a slowly changing scene doesn't go stale
+PERCEPTUAL_HASH_MAX_DISTANCE = 5
+PERCEPTUAL_REFRESH_HITS = 8
+
+# Longest edge sent to Groq - phone frames are re-encoded down to this
+VISION_MAX_EDGE = 768
+VISION_JPEG_QUALITY = 80
+
+# Constant part of every vision request body; per-call fields are filled in on a shallow copy
+_PAYLOAD_TEMPLATE = {
+    "model": VISION_MODEL,
+    "max_tokens": 1500,  # Let model generate full detailed analysis
+}
+
+
+def _downscale_image(image_base64: str) -> str:
+    """Shrink a base64 camera frame to VISION_MAX_EDGE and re-encode as JPEG (blocking)."""
+    img = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+    if max(img.size) <= VISION_MAX_EDGE and img.format == "JPEG":
+        return image_base64  # Already small enough - don't re-encode
+    img.draft("RGB", (VISION_MAX_EDGE, VISION_MAX_EDGE))  # JPEG DCT-domain downscale on decode
+    img.thumbnail((VISION_MAX_EDGE, VISION_MAX_EDGE), Image.BILINEAR)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    out = io.BytesIO()
+    img.save(out, "JPEG", quality=VISION_JPEG_QUALITY, optimize=False)
+    return base64.b64encode(out.getvalue()).decode()
+
+
+def _dhash(image_base64: str) -> int:
+    """64-bit difference hash of a base64 camera frame (blocking)."""
+    img = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+    img.draft("L", (64, 64))  # Only 9x8 pixels are needed - decode JPEG at 1/8 scale
+    px = img.convert("L").resize((9, 8), Image.BILINEAR).tobytes()
+    h = 0
+    bit = 1
+    for row in range(0, 72, 9):
+        for i in range(row, row + 8):
+            if px[i] > px[i + 1]:
+                h |= bit
+            bit <<= 1
+    return h
+
 
 # Type for image request callback: async function that sends request and returns image
 ImageRequestCallback = Callable[[str], Awaitable[Optional[str]]]  # session_id -> image_base64
@@ -36,15 +123,29 @@ class VisionEngine:
     def __init__(self):
         self.enabled = config.vision.enabled if hasattr(config, 'vision') and config.vision else True
         self.api_keys = config.llm.api_keys if config.llm.api_keys else []
-        self._current_key_index = 0
+        # count() advances atomically under the GIL - no read-modify-write race
+        self._key_counter = itertools.count()
+        # Request headers per API key - built once, reused for every call
+        self._headers_by_key: Dict[str, Dict[str, str]] = {}
         
-        # Single image storage: (session_id, image_base64, timestamp)
-        self._current_image: Optional[tuple] = None
+        # Latest image per session: session_id -> (image_base64, timestamp, data_url), LRU order
+        self._images: "OrderedDict[str, tuple]" = OrderedDict()
         
-        # Pre-analysis cache: (session_id, analysis_result, timestamp)
+        # Pre-analysis per session: session_id -> (analysis_result, timestamp, complete), LRU order
         # This runs in PARALLEL with ASR - ready when LLM needs it!
-        self._pre_analysis_cache: Optional[tuple] = None
-        self._pre_analysis_task: Optional[asyncio.Task] = None
+        self._pre_analysis_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pre_analysis_tasks: Dict[str, asyncio.Task] = {}
+        # Set (and replaced) whenever a streamed pre-analysis grows - wakes partial-result waiters
+        self._pre_analysis_progress: Dict[str, asyncio.Event] = {}
+        
+        # Image SHA-256 digest -> (analysis_result, timestamp), LRU order
+        self._analysis_by_hash: "OrderedDict[bytes, tuple]" = OrderedDict()
+        # dHash -> (content, timestamp, reuse count) for near-duplicate frames
+        self._analysis_by_dhash: "OrderedDict[int, tuple]" = OrderedDict()
+        
+        # Pooled HTTP session - reuses TCP+TLS connections to Groq across calls
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._warmup_task: Optional[asyncio.Task] = None
         
         self._initialized = False
     
@@ -54,36 +155,197 @@ class VisionEngine:
             logger.warning("vision_no_api_keys")
             return False
         
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=15)  # Longer timeout for detailed analysis
+            )
+        
         self._initialized = True
         logger.info("vision_initialized", model=VISION_MODEL)
+        
+        # Pre-open pooled connections in background (TCP + TLS off the critical path)
+        self._warmup_task = asyncio.create_task(self._warmup())
         return True
     
+    async def _warmup(self) -> None:
+        """Open VISION_WARM_CONNECTIONS keep-alive connections with cheap concurrent GETs."""
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *[self._warm_connection(self._get_api_key()) for _ in range(VISION_WARM_CONNECTIONS)],
+            return_exceptions=True
+        )
+        warmed = sum(1 for r in results if r is True)
+        logger.info("vision_warmup_complete",
+                   warmed=warmed,
+                   duration_ms=round((time.perf_counter() - start) * 1000, 2))
+    
+    async def _warm_connection(self, api_key: str) -> bool:
+        """GET the models list - establishes a pooled connection without using tokens."""
+        try:
+            async with self._session.get(GROQ_MODELS_URL, headers=self._headers(api_key)) as response:
+                await response.read()
+                return response.status == 200
+        except Exception as e:
+            logger.warning("vision_warmup_error", error=str(e))
+            return False
+    
+    async def shutdown(self) -> None:
+        """Close the pooled HTTP session."""
+        if self._warmup_task and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        for task in self._pre_analysis_tasks.values():
+            task.cancel()
+        self._pre_analysis_tasks.clear()
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._initialized = False
+        logger.info("vision_engine_shutdown")
+    
     def _get_api_key(self) -> str:
         """Get next API key (round-robin)."""
         if not self.api_keys:
             return ""
-        key = self.api_keys[self._current_key_index]
-        self._current_key_index = (self._current_key_index + 1) % len(self.api_keys)
-        return key
+        return self.api_keys[next(self._key_counter) % len(self.api_keys)]
+    
+    def _headers(self, api_key: str) -> Dict[str, str]:
+        """Cached request headers for an API key."""
+        headers = self._headers_by_key.get(api_key)
+        if headers is None:
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            }
+            self._headers_by_key[api_key] = headers
+        return headers
+    
+    @staticmethod
+    def _build_payload(prompt: str, data_url: str, temperature: float) -> dict:
+        """Request body from the shared template plus this call's prompt and image."""
+        payload = dict(_PAYLOAD_TEMPLATE)
+        payload["messages"] = [{
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {"type": "image_url", "image_url": {"url": data_url}}
+            ]
+        }]
+        payload["temperature"] = temperature
+        return payload
+    
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value, max_size: int) -> None:
+        """Insert as most-recent and evict the oldest entries past max_size."""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
+    
+    def pre_analysis_task(self, session_id: str) -> Optional[asyncio.Task]:
+        """The session's pre-analysis task if it is still running."""
+        task = self._pre_analysis_tasks.get(session_id)
+        return task if task and not task.done() else None
     
     def receive_image_and_preanalyze(self, session_id: str, image_base64: str) -> None:
         """
         Receive image and START PRE-ANALYSIS IMMEDIATELY.
         This runs in PARALLEL while user is still speaking.
         """
-        self._current_image = (session_id, image_base64, time.time())
+        data_url = f"data:image/jpeg;base64,{image_base64}"
+        self._remember(self._images, session_id, (image_base64, time.time(), data_url), MAX_VISION_SESSIONS)
         logger.info("image_received_starting_preanalysis", session_id=session_id[:8], size=len(image_base64))
         
-        # Cancel any existing pre-analysis
-        if self._pre_analysis_task and not self._pre_analysis_task.done():
-            self._pre_analysis_task.cancel()
+        # Cancel this session's previous pre-analysis (other sessions are untouched)
+        previous = self._pre_analysis_tasks.pop(session_id, None)
+        if previous and not previous.done():
+            previous.cancel()
+        stale = self._pre_analysis_cache.get(session_id)
+        if stale and not stale[2]:
+            del self._pre_analysis_cache[session_id]  # Partial text about the old frame
+        
+        # Same bytes as a recent frame (client re-send/retry)? Reuse that analysis.
+        image_hash = hashlib.sha256(image_base64.encode()).digest()
+        cached = self._analysis_by_hash.get(image_hash)
+        if cached and time.time() - cached[1] < ANALYSIS_CACHE_TTL_SECONDS:
+            self._analysis_by_hash.move_to_end(image_hash)
+            self._remember(self._pre_analysis_cache, session_id, (cached[0], time.time(), True), MAX_VISION_SESSIONS)
+            logger.info("pre_analysis_cache_hit", session_id=session_id[:8])
+            return
         
         # Start pre-analysis in background (PARALLEL with ASR!)
-        self._pre_analysis_task = asyncio.create_task(
-            self._run_pre_analysis(session_id, image_base64)
+        task = asyncio.create_task(self._run_pre_analysis(session_id, image_base64, image_hash))
+        self._pre_analysis_tasks[session_id] = task
+        task.add_done_callback(
+            lambda t: self._pre_analysis_tasks.pop(session_id, None)
+            if self._pre_analysis_tasks.get(session_id) is t else None
         )
     
-    async def _run_pre_analysis(self, session_id: str, image_base64: str) -> None:
+    def clear_session(self, session_id: str) -> None:
+        """Drop a disconnected session's image, pre-analysis and running task."""
+        task = self._pre_analysis_tasks.pop(session_id, None)
+        if task and not task.done():
+            task.cancel()
+        self._images.pop(session_id, None)
+        self._pre_analysis_cache.pop(session_id, None)
+        self._notify_progress(session_id)
+    
+    def _notify_progress(self, session_id: str) -> None:
+        """Wake everyone waiting on this session's pre-analysis progress."""
+        event = self._pre_analysis_progress.pop(session_id, None)
+        if event:
+            event.set()
+    
+    def _image_data_url(self, session_id: str, image_base64: str) -> str:
+        """Data URL for an image - reuses the one built on arrival when possible."""
+        stored = self._images.get(session_id)
+        if stored and stored[0] is image_base64:
+            return stored[2]
+        return f"data:image/jpeg;base64,{image_base64}"
+    
+    async def _prepare_image(self, session_id: str, image_base64: str) -> str:
+        """Downscale the frame off the event loop and swap it into the session's image slot."""
+        if not PIL_AVAILABLE:
+            return self._image_data_url(session_id, image_base64)
+        try:
+            small = await asyncio.to_thread(_downscale_image, image_base64)
+        except Exception as e:
+            logger.warning("image_downscale_failed", error=str(e))
+            return self._image_data_url(session_id, image_base64)
+        
+        data_url = f"data:image/jpeg;base64,{small}"
+        stored = self._images.get(session_id)
+        if stored and stored[0] is image_base64:
+            self._images[session_id] = (small, stored[1], data_url)
+        logger.debug("image_downscaled", original=len(image_base64), size=len(small))
+        return data_url
+    
+    def _reuse_similar_analysis(self, session_id: str, dhash: int) -> bool:
+        """Serve a recent analysis of a perceptually similar frame, if there is one."""
+        now = time.time()
+        match = None
+        for key, entry in reversed(self._analysis_by_dhash.items()):
+            if (now - entry[1] < ANALYSIS_CACHE_TTL_SECONDS
+                    and (key ^ dhash).bit_count() <= PERCEPTUAL_HASH_MAX_DISTANCE):
+                match = key
+                break
+        if match is None:
+            return False
+        
+        content, ts, hits = self._analysis_by_dhash[match]
+        if hits >= PERCEPTUAL_REFRESH_HITS:
+            return False  # Reused enough - refresh with a real analysis
+        self._remember(self._analysis_by_dhash, match, (content, ts, hits + 1), ANALYSIS_CACHE_SIZE)
+        self._remember(self._pre_analysis_cache, session_id, (content, now, True), MAX_VISION_SESSIONS)
+        logger.info("pre_analysis_similar_hit", session_id=session_id[:8],
+                   distance=(match ^ dhash).bit_count(), reuse=hits + 1)
+        return True
+    
+    async def _run_pre_analysis(self, session_id: str, image_base64: str, image_hash: bytes) -> None:
         """
         Pre-analyze what we see while user speaks.
         Result is cached for instant retrieval when LLM needs it.
@@ -94,6 +356,19 @@ class VisionEngine:
         if not api_key:
             return
         
+        # Near-duplicate of a recent frame? Reuse its analysis instead of another VLM call
+        dhash = None
+        if PIL_AVAILABLE:
+            try:
+                dhash = await asyncio.to_thread(_dhash, image_base64)
+            except Exception as e:
+                logger.debug("image_dhash_failed", error=str(e))
+        if dhash is not None and self._reuse_similar_analysis(session_id, dhash):
+            self._notify_progress(session_id)
+            return
+        
+        data_url = await self._prepare_image(session_id, image_base64)
+        
         # Natural observation prompt with gender detection for Hindi grammar
         prompt = """You are looking at someone/something right now. Describe what you observe:
 
@@ -124,120 +399,146 @@ For OBJECTS:
 
 Focus on SPECIFIC observable details that could be mentioned in conversation."""
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": VISION_MODEL,
-            "messages": [{
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}
-                    }
-                ]
-            }],
-            "max_tokens": 1500,  # Let model generate full detailed analysis
-            "temperature": 0.2
-        }
+        headers = self._headers(api_key)
+        payload = self._build_payload(prompt, data_url, temperature=0.2)
+        # OPTIMIZED: stream, so the first lines are usable while the rest generates
+        payload["stream"] = True
         
+        parts = []
+        length = 0
+        partial_published = False
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    GROQ_API_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=15)  # Longer timeout for detailed analysis
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        choices = result.get("choices", [])
-                        if choices:
-                            content = choices[0].get("message", {}).get("content", "")
-                            latency_ms = (time.time() - start_time) * 1000
-                            
-                            # Cache the result
-                            self._pre_analysis_cache = (session_id, content, time.time())
-                            logger.info("pre_analysis_complete", 
-                                       session_id=session_id[:8],
-                                       latency_ms=f"{latency_ms:.0f}",
-                                       result_length=len(content),
-                                       result_preview=content[:200])
-                    else:
-                        logger.warning("pre_analysis_api_error", status=response.status)
+            async with self._session.post(
+                GROQ_API_URL,
+                data=_json_dumps(payload),
+                headers=headers
+            ) as response:
+                if response.status != 200:
+                    logger.warning("pre_analysis_api_error", status=response.status)
+                    return
+                
+                async for line in response.content:
+                    line = line.strip()
+                    if not line.startswith(_SSE_DATA_PREFIX):
+                        continue
+                    if line == _SSE_DONE:
+                        break
+                    try:
+                        choices = _json_loads(line.removeprefix(_SSE_DATA_PREFIX)).get("choices")
+                    except ValueError:
+                        continue
+                    if not choices:
+                        continue
+                    delta = choices[0].get("delta", {}).get("content")
+                    if not delta:
+                        continue
+                    
+                    parts.append(delta)
+                    length += len(delta)
+                    # Publish the partial text once it is long enough for min_length
+                    # waiters to go early - not per delta, which re-joins everything
+                    if not partial_published and length >= PRE_ANALYSIS_MIN_CHARS:
+                        partial_published = True
+                        self._remember(self._pre_analysis_cache, session_id,
+                                       ("".join(parts), time.time(), False), MAX_VISION_SESSIONS)
+                        self._notify_progress(session_id)
+            
+            if not parts:
+                return
+            content = "".join(parts)
+            latency_ms = (time.time() - start_time) * 1000
+            
+            # Cache the result
+            now = time.time()
+            self._remember(self._pre_analysis_cache, session_id, (content, now, True), MAX_VISION_SESSIONS)
+            self._remember(self._analysis_by_hash, image_hash, (content, now), ANALYSIS_CACHE_SIZE)
+            if dhash is not None:
+                self._remember(self._analysis_by_dhash, dhash, (content, now, 0), ANALYSIS_CACHE_SIZE)
+            logger.info("pre_analysis_complete", 
+                       session_id=session_id[:8],
+                       latency_ms=f"{latency_ms:.0f}",
+                       result_length=len(content),
+                       result_preview=content)
         except asyncio.CancelledError:
             logger.info("pre_analysis_cancelled", session_id=session_id[:8])
         except Exception as e:
             logger.warning("pre_analysis_error", error=str(e))
+        finally:
+            self._notify_progress(session_id)
     
-    def get_pre_analysis(self, session_id: str, max_age_seconds: float = 30.0) -> Optional[str]:
+    def get_pre_analysis(self, session_id: str, max_age_seconds: float = 30.0,
+                         min_length: Optional[int] = None) -> Optional[str]:
         """
         Get cached pre-analysis result (INSTANT - no API call!).
-        Returns None if no result or too old.
+        Returns None if no result or too old. A still-streaming result is
+        returned only when min_length is given and at least that much has arrived.
         """
-        if not self._pre_analysis_cache:
+        cached = self._pre_analysis_cache.get(session_id)
+        if not cached:
             return None
         
-        stored_session, analysis, timestamp = self._pre_analysis_cache
-        
-        if stored_session != session_id:
+        analysis, timestamp, complete = cached
+        if not complete and (min_length is None or len(analysis) < min_length):
             return None
         
         age = time.time() - timestamp
         if age > max_age_seconds:
             return None
         
-        logger.info("pre_analysis_used", session_id=session_id[:8], age_ms=int(age*1000))
+        logger.info("pre_analysis_used", session_id=session_id[:8], age_ms=int(age*1000), complete=complete)
         return analysis
     
-    async def wait_for_pre_analysis(self, session_id: str, timeout: float = 5.0) -> Optional[str]:
+    async def wait_for_pre_analysis(self, session_id: str, timeout: float = 5.0,
+                                    min_length: Optional[int] = None) -> Optional[str]:
         """
         Wait for pre-analysis to complete if it's still running.
-        Returns the result if available within timeout.
+        Returns the result if available within timeout; with min_length, returns
+        as soon as that much of a streaming result has arrived.
         """
-        start = time.time()
-        while time.time() - start < timeout:
-            # Check if we already have result
-            result = self.get_pre_analysis(session_id)
-            if result:
-                return result
+        # Check if we already have result
+        result = self.get_pre_analysis(session_id, min_length=min_length)
+        if result:
+            return result
+        
+        # OPTIMIZED: wake on task completion (or streamed progress) instead of polling.
+        # asyncio.wait never cancels the shared pre-analysis task on timeout.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            task = self.pre_analysis_task(session_id)
+            remaining = deadline - loop.time()
+            if not task or remaining <= 0:
+                break
             
-            # Check if task is still running
-            if self._pre_analysis_task and not self._pre_analysis_task.done():
-                await asyncio.sleep(0.2)  # Wait a bit
-                continue
+            waiters = {task}
+            progress = None
+            if min_length is not None:
+                event = self._pre_analysis_progress.setdefault(session_id, asyncio.Event())
+                progress = asyncio.ensure_future(event.wait())
+                waiters.add(progress)
+            try:
+                await asyncio.wait(waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if progress:
+                    progress.cancel()
             
-            # Task done but no result? Check one more time
-            result = self.get_pre_analysis(session_id)
+            result = self.get_pre_analysis(session_id, min_length=min_length)
             if result:
                 return result
-            
-            # No task running and no result
-            break
         
-        return None
+        return self.get_pre_analysis(session_id, min_length=min_length)
     
     def has_image(self, session_id: str) -> bool:
         """Check if we have an image for this session."""
-        if not self._current_image:
-            return False
-        stored_session, _, _ = self._current_image
-        return stored_session == session_id
+        return session_id in self._images
     
     def get_present_image(self, session_id: str, max_age_seconds: float = 30.0) -> Optional[str]:
         """Get the current image for this session."""
-        if not self._current_image:
-            return None
-        
-        stored_session, image_base64, timestamp = self._current_image
-        
-        if stored_session != session_id:
+        stored = self._images.get(session_id)
+        if not stored:
             return None
         
+        image_base64, timestamp, _ = stored
         age = time.time() - timestamp
         if age > max_age_seconds:
             return None
@@ -301,49 +602,29 @@ Analyze this image and answer their question directly:
 Answer their specific question with real details from the image.
 Never say "I cannot see" or "the image is blurry" - describe what IS visible."""
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": VISION_MODEL,
-            "messages": [{
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"}
-                    }
-                ]
-            }],
-            "max_tokens": 1500,  # Let model generate full detailed response
-            "temperature": 0.3
-        }
+        headers = self._headers(api_key)
+        payload = self._build_payload(prompt, self._image_data_url(session_id, image_base64), temperature=0.3)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    GROQ_API_URL,
-                    json=payload,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        choices = result.get("choices", [])
-                        if choices:
-                            content = choices[0].get("message", {}).get("content", "")
-                            latency_ms = (time.time() - start_time) * 1000
-                            logger.info("targeted_analysis_complete", 
-                                       session_id=session_id[:8],
-                                       latency_ms=f"{latency_ms:.0f}")
-                            return content
-                    else:
-                        error = await response.text()
-                        logger.warning("vision_api_error", status=response.status, error=error[:100])
-                        return "Vision analysis failed."
+            async with self._session.post(
+                GROQ_API_URL,
+                data=_json_dumps(payload),
+                headers=headers
+            ) as response:
+                if response.status == 200:
+                    result = _json_loads(await response.read())
+                    choices = result.get("choices", [])
+                    if choices:
+                        content = choices[0].get("message", {}).get("content", "")
+                        latency_ms = (time.time() - start_time) * 1000
+                        logger.info("targeted_analysis_complete", 
+                                   session_id=session_id[:8],
+                                   latency_ms=f"{latency_ms:.0f}")
+                        return content
+                else:
+                    error = await response.text()
+                    logger.warning("vision_api_error", status=response.status, error=error[:100])
+                    return "Vision analysis failed."
         except Exception as e:
             logger.warning("vision_exception", error=str(e))
             return f"Vision error: {str(e)}"
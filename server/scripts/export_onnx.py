@@ -0,0 +1,59 @@
+"""
+Export the RAG embedding model to ONNX with INT8 dynamic quantization.
+
+Run once from the server directory:
+    pip install "optimum[onnxruntime]"
+    python scripts/export_onnx.py
+
+RAGEngine picks the model up automatically from data/onnx/ on next start
+(set ZENI_RAG_BACKEND=torch to keep using SentenceTransformer).
+"""
+
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+from engines.rag import EMBEDDING_MODEL, ONNX_MODEL_DIR, ONNX_MODEL_FILE
+
+
+def main():
+    print(f"📦 Exporting {EMBEDDING_MODEL} to ONNX...")
+    start = time.time()
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        model = ORTModelForFeatureExtraction.from_pretrained(EMBEDDING_MODEL, export=True)
+        model.save_pretrained(export_dir)
+        print(f"   Exported in {time.time() - start:.1f}s")
+
+        # Dynamic (weight-only) INT8 quantization for the host CPU
+        if platform.machine().lower() in ("arm64", "aarch64"):
+            qconfig = AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+        else:
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+
+        print("   Quantizing to INT8...")
+        if os.path.exists(ONNX_MODEL_DIR):
+            shutil.rmtree(ONNX_MODEL_DIR)
+        os.makedirs(ONNX_MODEL_DIR)
+
+        quantizer = ORTQuantizer.from_pretrained(export_dir)
+        quantizer.quantize(save_dir=ONNX_MODEL_DIR, quantization_config=qconfig)
+
+    AutoTokenizer.from_pretrained(EMBEDDING_MODEL, use_fast=True).save_pretrained(ONNX_MODEL_DIR)
+
+    model_path = os.path.join(ONNX_MODEL_DIR, ONNX_MODEL_FILE)
+    size_mb = os.path.getsize(model_path) / (1024 * 1024)
+    print(f"✅ Saved {model_path} ({size_mb:.0f} MB) in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
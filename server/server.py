@@ -5,14 +5,28 @@ Main FastAPI application with WebSocket support for real-time voice interaction.
 
 import asyncio
 import base64
+import contextvars
 import json
+import math
+import socket
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import Optional
 
+import numpy as np
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+
+# OPTIMIZED: orjson renders every API response (several times faster than stdlib json)
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as JSONResponse
+    _dumps_pretty = lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    from fastapi.responses import JSONResponse
+    _dumps_pretty = lambda obj: json.dumps(obj, indent=2).encode()
 
 from core.config import config, env_settings
 from core.logging import setup_logging, get_logger, asr_latency, llm_latency, tts_latency, pipeline_latency
@@ -20,11 +34,26 @@ from core.protocol import (
     MessageType, SessionState, Language,
     parse_client_message, SessionStartMessage, AudioFrameMessage,
     InterruptMessage, HeartbeatMessage, SessionEndMessage,
-    ErrorMessage, HeartbeatAckMessage, TranscriptFinalMessage
+    ErrorMessage, TranscriptFinalMessage, decode_message, encode_message,
+    send_control_message, send_control_model, decode_msgpack, MSGPACK_AVAILABLE, MSGPACK_SUBPROTOCOL, FRAME_TAG_CONTROL,
+    LanguageChangeMessage, VoiceChangeMessage, TtsProviderChangeMessage, TtsSpeedChangeMessage,
+    PersonalityChangeMessage
 )
 from core.session import session_manager, Session
 from core.pipeline import pipeline_manager, StreamingPipeline
 
+# Optional engines - imported once here, not inside per-message handlers
+try:
+    from engines.vision import get_vision_engine, initialize_vision
+except ImportError:
+    get_vision_engine = None
+    initialize_vision = None
+
+try:
+    from engines.rag import get_faq_context
+except ImportError:
+    get_faq_context = None
+
 # Admin module
 from admin import admin_router
 
@@ -38,14 +67,26 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("zeni_server_starting", port=config.server.port)
     
+    # Size the default executor explicitly - the stdlib default (cpu+4) queues
+    # blocking work behind itself once several sessions are active
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=env_settings.thread_pool_size, thread_name_prefix="zeni")
+    )
+    
+    # OPTIMIZED: eager tasks run their first step inline, so short coroutines
+    # (cached RAG lookups, skipped pre-analysis) finish without being scheduled
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        logger.info("eager_task_factory_enabled")
+    
     # Initialize components
     await session_manager.start()
     await pipeline_manager.initialize()
     
     # Initialize vision engine (non-blocking, optional)
     try:
-        from engines.vision import initialize_vision
-        await initialize_vision()
+        if initialize_vision:
+            await initialize_vision()
     except Exception as e:
         logger.warning("vision_init_failed", error=str(e))
     
@@ -57,6 +98,11 @@ async def lifespan(app: FastAPI):
     logger.info("zeni_server_shutting_down")
     await session_manager.stop()
     await pipeline_manager.shutdown()
+    try:
+        if get_vision_engine:
+            await get_vision_engine().shutdown()
+    except Exception as e:
+        logger.warning("vision_shutdown_failed", error=str(e))
     logger.info("zeni_server_stopped")
 
 
@@ -65,7 +111,8 @@ app = FastAPI(
     title="Zeni Voice AI",
     description="Real-time voice AI assistant with streaming support",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=JSONResponse
 )
 
 # Add CORS middleware
@@ -100,17 +147,15 @@ async def health_check():
 @app.get("/debug/image")
 async def debug_get_image():
     """Debug endpoint to view current captured image."""
-    from fastapi.responses import Response
     try:
-        from engines.vision import get_vision_engine
         vision = get_vision_engine()
         
-        if vision._current_image:
-            session_id, image_base64, timestamp = vision._current_image
+        if vision._images:
+            # Most recently received image across sessions
+            session_id, (image_base64, timestamp, _) = next(reversed(vision._images.items()))
             age_seconds = time.time() - timestamp
             
             # Return image info and optionally the image itself
-            import base64
             image_bytes = base64.b64decode(image_base64)
             
             return Response(
@@ -120,7 +165,7 @@ async def debug_get_image():
                     "X-Session-ID": session_id[:8],
                     "X-Age-Seconds": str(int(age_seconds)),
                     "X-Image-Size": str(len(image_base64)),
-                    "X-Pre-Analysis": vision._pre_analysis_cache[1][:200] if vision._pre_analysis_cache else "none"
+                    "X-Pre-Analysis": vision._pre_analysis_cache[session_id][0][:200] if session_id in vision._pre_analysis_cache else "none"
                 }
             )
         else:
@@ -133,16 +178,15 @@ async def debug_get_image():
 async def debug_image_info():
     """Debug endpoint to get image analysis info."""
     try:
-        from engines.vision import get_vision_engine
         vision = get_vision_engine()
         
         result = {
-            "has_image": vision._current_image is not None,
-            "has_pre_analysis": vision._pre_analysis_cache is not None
+            "has_image": bool(vision._images),
+            "has_pre_analysis": bool(vision._pre_analysis_cache)
         }
         
-        if vision._current_image:
-            session_id, image_base64, timestamp = vision._current_image
+        if vision._images:
+            session_id, (image_base64, timestamp, _) = next(reversed(vision._images.items()))
             result["image"] = {
                 "session_id": session_id[:8],
                 "size_bytes": len(image_base64),
@@ -150,10 +194,11 @@ async def debug_image_info():
             }
         
         if vision._pre_analysis_cache:
-            session_id, analysis, timestamp = vision._pre_analysis_cache
+            session_id, (analysis, timestamp, complete) = next(reversed(vision._pre_analysis_cache.items()))
             result["pre_analysis"] = {
                 "session_id": session_id[:8],
                 "result": analysis,
+                "complete": complete,
                 "age_seconds": int(time.time() - timestamp)
             }
         
@@ -191,10 +236,45 @@ async def get_metrics():
 
 # ============== Public API for Android App ==============
 
+import os
 from pathlib import Path
-from fastapi.responses import FileResponse
+from fastapi.responses import RedirectResponse, Response
+from starlette.staticfiles import StaticFiles
 
 PLACEMENT_DIR = Path(__file__).parent.parent / "Placement"
+PLACEMENT_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.gif', '.webp'))
+PLACEMENT_STATIC_PATH = "/api/placements/static"
+
+# OPTIMIZED: listing JSON cached until the directory's mtime changes (add/remove/rename)
+_placements_mtime_ns = -1
+_placements_body = b""
+
+
+def _scan_placements() -> bytes:
+    """Encoded /api/placements response, rebuilt only when PLACEMENT_DIR changes."""
+    global _placements_mtime_ns, _placements_body
+    try:
+        mtime_ns = PLACEMENT_DIR.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    if mtime_ns == _placements_mtime_ns:
+        return _placements_body
+    
+    photos = []
+    if mtime_ns:
+        # scandir entries carry the file type, so no stat() per file
+        with os.scandir(PLACEMENT_DIR) as entries:
+            for entry in entries:
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in PLACEMENT_EXTENSIONS:
+                    photos.append({
+                        "name": entry.name,
+                        "url": f"{PLACEMENT_STATIC_PATH}/{entry.name}"
+                    })
+    
+    _placements_body = encode_message({"success": True, "photos": photos, "total": len(photos)}).encode()
+    _placements_mtime_ns = mtime_ns
+    return _placements_body
+
 
 @app.get("/api/placements")
 async def get_public_placements():
@@ -202,51 +282,72 @@ async def get_public_placements():
     Public API for Android app to get placement photos.
     No authentication required.
     """
-    if not PLACEMENT_DIR.exists():
-        return {"success": True, "photos": [], "total": 0}
-    
-    photos = []
-    for file in PLACEMENT_DIR.iterdir():
-        if file.is_file() and file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-            photos.append({
-                "name": file.name,
-                "url": f"/api/placements/{file.name}"
-            })
+    return Response(content=_scan_placements(), media_type="application/json")
+
+
+class _PlacementFiles(StaticFiles):
+    """StaticFiles (ETag/Last-Modified, 304s, path-safe lookup) plus a client cache lifetime."""
     
-    return {"success": True, "photos": photos, "total": len(photos)}
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", "public, max-age=300")
+        return response
+
+
+# OPTIMIZED: photos served by Starlette's file responder - uses the ASGI pathsend
+# extension (zero-copy) on servers that offer it, chunked reads otherwise
+app.mount(
+    PLACEMENT_STATIC_PATH,
+    _PlacementFiles(directory=str(PLACEMENT_DIR), check_dir=False),
+    name="placements"
+)
 
 
 @app.get("/api/placements/{filename}")
 async def get_public_placement_file(filename: str):
-    """Serve placement photo for Android app (public access)."""
-    file_path = PLACEMENT_DIR / filename
-    if not file_path.exists():
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail="File not found")
-    
-    return FileResponse(file_path)
+    """Old photo URL - redirects to the static mount."""
+    return RedirectResponse(f"{PLACEMENT_STATIC_PATH}/{filename}", status_code=301)
 
 
 # ============== Personality Settings API ==============
 
 from core.protocol import Personality
-import json
 
 SETTINGS_FILE = Path(__file__).parent / "data" / "settings.json"
 
+# Saved personality name -> enum (also the set of valid names)
+_PERSONALITY_MAP = {
+    "assistant": Personality.ASSISTANT,
+    "human": Personality.HUMAN,
+    "general": Personality.GENERAL,
+}
+
+# OPTIMIZED: parsed settings kept in memory, re-read only when the file's mtime changes
+_settings_cache: Optional[dict] = None
+_settings_mtime_ns = -1
+
 def load_settings() -> dict:
-    """Load global settings from file."""
-    if SETTINGS_FILE.exists():
+    """Load global settings (cached; a stat() per call instead of read + parse)."""
+    global _settings_cache, _settings_mtime_ns
+    try:
+        mtime_ns = SETTINGS_FILE.stat().st_mtime_ns
+    except OSError:
+        return {"personality": "assistant"}
+    if mtime_ns != _settings_mtime_ns:
         try:
-            return json.loads(SETTINGS_FILE.read_text())
+            _settings_cache = decode_message(SETTINGS_FILE.read_bytes())
         except:
-            pass
-    return {"personality": "assistant"}
+            return {"personality": "assistant"}
+        _settings_mtime_ns = mtime_ns
+    return dict(_settings_cache)  # Callers may modify their copy
 
 def save_settings(settings: dict):
     """Save global settings to file."""
+    global _settings_cache, _settings_mtime_ns
     SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SETTINGS_FILE.write_text(json.dumps(settings, indent=2))
+    SETTINGS_FILE.write_bytes(_dumps_pretty(settings))
+    _settings_cache = dict(settings)
+    _settings_mtime_ns = SETTINGS_FILE.stat().st_mtime_ns
 
 
 @app.get("/api/settings")
@@ -268,7 +369,7 @@ async def set_personality(request_body: dict):
     personality = request_body.get("personality", "assistant")
     
     # Validate - now includes "general" mode
-    if personality not in ["assistant", "human", "general"]:
+    if personality not in _PERSONALITY_MAP:
         raise HTTPException(status_code=400, detail="Invalid personality. Use 'assistant', 'human', or 'general'")
     
     # Save
@@ -276,18 +377,9 @@ async def set_personality(request_body: dict):
     settings["personality"] = personality
     save_settings(settings)
     
-    # Update ALL active sessions immediately!
-    if personality == "human":
-        personality_enum = Personality.HUMAN
-    elif personality == "general":
-        personality_enum = Personality.GENERAL
-    else:
-        personality_enum = Personality.ASSISTANT
-    
-    updated_count = 0
-    for session in session_manager.sessions.values():
-        session.config.personality = personality_enum
-        updated_count += 1
+    # Update ALL active sessions immediately - each reads it on its next turn
+    session_manager.set_global_personality(_PERSONALITY_MAP[personality])
+    updated_count = len(session_manager.sessions)
     
     logger.info("personality_setting_changed", 
                new_personality=personality,
@@ -303,29 +395,151 @@ async def set_personality(request_body: dict):
 
 # ============== WebSocket Handler ==============
 
+# Speech energy (RMS) above which user audio interrupts a response (300 is typical for speech)
+INTERRUPT_RMS_THRESHOLD = 300
+_INTERRUPT_RMS_THRESHOLD_SQ = INTERRUPT_RMS_THRESHOLD * INTERRUPT_RMS_THRESHOLD
+
+# How long an interrupt waits for the cancelled pipeline to unwind before moving the
+# session to LISTENING; the pipeline's own IDLE transitions must land before that
+INTERRUPT_TEARDOWN_WAIT = 0.1  # seconds
+
+_b64decode = base64.b64decode  # Legacy JSON audio path only
+
+# Validated language by raw wire value - only valid values get in, so it is bounded
+# by the Language enum and needs no expiry
+_LANGUAGE_CACHE: dict = {}
+
+# OPTIMIZED: heartbeat acks are pre-serialized - only the timestamp changes per ack,
+# so JSON clients get a string splice instead of a pydantic model + json.dumps
+_HEARTBEAT_ACK_TYPE = MessageType.HEARTBEAT_ACK.value
+_HEARTBEAT_ACK_JSON_PREFIX = encode_message({"type": _HEARTBEAT_ACK_TYPE, "timestamp": 0})[:-2]
+
+# Speculative RAG prefetches allowed in flight across all sessions - beyond this
+# the server is busy and the prefetch would only compete with real turns
+MAX_SPECULATIVE_RAG_INFLIGHT = 4
+_speculative_rag_inflight = 0
+
+# OPTIMIZED: dtypes and NumPy functions resolved once, not per audio frame
+_I16 = np.dtype("<i2")  # Client PCM is little-endian int16
+_I64 = np.dtype(np.int64)
+_np_frombuffer = np.frombuffer
+_np_einsum = np.einsum
+
+# Speculative prefetches need no request context; on 3.11+ they start in this shared
+# empty Context instead of copying the caller's per task
+_EMPTY_CONTEXT = contextvars.Context() if sys.version_info >= (3, 11) else None
+
+
+def _speech_energy(audio_bytes: bytes) -> Optional[int]:
+    """
+    RMS of an int16 PCM frame if it is loud enough to interrupt, else None.
+    One int64 pass over the buffer; compared squared, so quiet frames skip the sqrt.
+    """
+    samples = _np_frombuffer(audio_bytes, _I16)
+    if not samples.size:
+        return None
+    sum_sq = int(_np_einsum("i,i->", samples, samples, dtype=_I64))
+    if sum_sq <= _INTERRUPT_RMS_THRESHOLD_SQ * samples.size:
+        return None
+    return int(math.sqrt(sum_sq / samples.size))
+
+
+class _LatestQueue:
+    """Single-slot queue: a new item replaces one the consumer hasn't taken yet (latest wins)."""
+    
+    def __init__(self):
+        self._q: asyncio.Queue = asyncio.Queue(maxsize=1)
+    
+    def put_nowait(self, item) -> bool:
+        """Store item; True if it replaced a stale one."""
+        try:
+            self._q.get_nowait()
+            replaced = True
+        except asyncio.QueueEmpty:
+            replaced = False
+        self._q.put_nowait(item)
+        return replaced
+    
+    async def get(self):
+        return await self._q.get()
+    
+    def empty(self) -> bool:
+        return self._q.empty()
+
+
 class VoiceSessionHandler:
     """
     Handles a single WebSocket voice session.
     Manages the complete lifecycle from connection to disconnection.
     """
     
+    # Background waits on cancelled tasks (strong refs until they finish)
+    _pending_cleanups: set = set()
+    
+    @classmethod
+    def _cancel_and_forget(cls, task: Optional[asyncio.Task], timeout: float = 5.0) -> None:
+        """Cancel a task and let its teardown finish in the background (bounded by timeout)."""
+        if not task or task.done():
+            return
+        task.cancel()
+        drain = asyncio.ensure_future(asyncio.wait({task}, timeout=timeout))
+        cls._pending_cleanups.add(drain)
+        drain.add_done_callback(cls._pending_cleanups.discard)
+    
     def __init__(self, websocket: WebSocket):
         self.websocket = websocket
         self.session: Optional[Session] = None
         self.pipeline: Optional[StreamingPipeline] = None
         self._processing_task: Optional[asyncio.Task] = None
-        self._queue_checker_task: Optional[asyncio.Task] = None
         self._keepalive_task: Optional[asyncio.Task] = None
         self._is_processing = False  # Flag to prevent concurrent pipeline runs
+        # Bumped per claimed utterance and per interrupt; a turn whose generation is
+        # stale when it unwinds leaves the flag and pipeline state to the newer owner
+        self._turn_generation = 0
+        # OPTIMIZED: finals go to one long-lived consumer instead of a Task each
+        self._final_queue = _LatestQueue()
+        self._final_consumer_task: Optional[asyncio.Task] = None
+        # Set when the ASR final callback fires; cleared when a new utterance starts
+        self._final_event = asyncio.Event()
+        # True once the ASR engine calls _on_final_transcript itself for every final
+        self._asr_owns_finals = False
         self._connection_alive = True
+        self._msgpack = False  # Negotiated MessagePack framing for control messages
+        self._json_audio_warned = False  # Deprecated Base64 audio logged once per connection
+        
+        # Message type -> handler, all called as handler(data)
+        self._handlers = {
+            MessageType.SESSION_START.value: self._handle_session_start,
+            MessageType.AUDIO_FRAME.value: self._handle_audio_frame,
+            MessageType.IMAGE_FRAME.value: self._handle_image_frame,
+            MessageType.INTERRUPT.value: self._handle_interrupt,
+            MessageType.LANGUAGE_CHANGE.value: self._handle_language_change,
+            MessageType.VOICE_CHANGE.value: self._handle_voice_change,
+            MessageType.TTS_PROVIDER_CHANGE.value: self._handle_tts_provider_change,
+            MessageType.TTS_SPEED_CHANGE.value: self._handle_tts_speed_change,
+            MessageType.PERSONALITY_CHANGE.value: self._handle_personality_change,
+            MessageType.SPEECH_FINISHED.value: self._handle_speech_finished,
+            MessageType.HEARTBEAT.value: self._handle_heartbeat,
+            "ping": self._handle_ping,
+            "pong": self._handle_pong,
+            MessageType.SESSION_END.value: self._handle_session_end,
+            MessageType.ROBOT_STATUS.value: self._handle_robot_status,
+        }
     
     async def handle_connection(self):
         """Main connection handler."""
-        await self.websocket.accept()
-        logger.info("websocket_connected")
+        # Clients that offer the msgpack subprotocol get binary control frames
+        if MSGPACK_AVAILABLE and MSGPACK_SUBPROTOCOL in self.websocket.scope.get("subprotocols", ()):
+            self._msgpack = True
+            self.websocket.state.msgpack = True
+            await self.websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        else:
+            await self.websocket.accept()
+        logger.info("websocket_connected", msgpack=self._msgpack)
         
         # Start keepalive task to prevent connection timeout
         self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+        self._final_consumer_task = asyncio.create_task(self._final_consumer())
         
         try:
             await self._message_loop()
@@ -343,14 +557,18 @@ class VoiceSessionHandler:
         """
         Send periodic ping messages to keep connection alive.
         Prevents network/proxy timeouts from dropping the connection.
+        
+        OPTIMIZED: dead peers are found by kernel TCP keepalive (see main) and
+        WebSocket protocol pings; this is only a slow backstop for middleboxes.
         """
-        KEEPALIVE_INTERVAL = 25  # Send ping every 25 seconds
+        KEEPALIVE_INTERVAL = 300  # Send ping every 5 minutes
+        loop_time = asyncio.get_running_loop().time
         
         while self._connection_alive:
             try:
                 await asyncio.sleep(KEEPALIVE_INTERVAL)
                 if self._connection_alive:
-                    await self._send_message({"type": "ping", "timestamp": asyncio.get_event_loop().time()})
+                    await self._send_message({"type": "ping", "timestamp": loop_time()})
             except Exception as e:
                 logger.debug("keepalive_error", error=str(e))
                 break
@@ -362,30 +580,56 @@ class VoiceSessionHandler:
         OPTIMIZED: Handles both text (JSON) and binary (raw audio) frames.
         Binary frames eliminate 33% Base64 overhead + JSON parsing for audio.
         """
-        while True:
-            try:
-                # Receive either text or bytes
-                message = await self.websocket.receive()
+        # OPTIMIZED: bind hot-path callables once - no attribute lookups per frame
+        receive = self.websocket.receive
+        handle_audio = self._handle_binary_audio
+        handle_text = self._handle_text_frame
+        msgpack = self._msgpack
+        
+        try:
+            while True:
+                message = await receive()
                 
-                if message["type"] == "websocket.disconnect":
-                    break
-                elif message["type"] == "websocket.receive":
-                    if "text" in message:
-                        # JSON message (control messages)
-                        try:
-                            data = json.loads(message["text"])
-                            await self._handle_message(data)
-                        except json.JSONDecodeError as e:
-                            logger.warning("invalid_json", error=str(e))
-                            await self._send_error(400, "Invalid JSON message")
-                    elif "bytes" in message:
+                # Binary audio dominates - check it first
+                frame = message.get("bytes")
+                if frame is not None:
+                    if not msgpack:
                         # Binary audio frame - FAST PATH!
-                        await self._handle_binary_audio(message["bytes"])
-            except Exception as e:
-                if "disconnect" in str(e).lower():
+                        await handle_audio(frame)
+                    elif frame and frame[0] == FRAME_TAG_CONTROL:
+                        await self._handle_msgpack_frame(frame)
+                    elif frame:
+                        await handle_audio(frame[1:])
+                    continue
+                
+                text = message.get("text")
+                if text is not None:
+                    await handle_text(text)
+                elif message["type"] == "websocket.disconnect":
                     break
+        except Exception as e:
+            if "disconnect" not in str(e).lower():
                 logger.error("message_loop_error", error=str(e))
-                break
+    
+    async def _handle_text_frame(self, text: str):
+        """JSON control message."""
+        try:
+            data = decode_message(text)
+        except ValueError as e:  # json/orjson JSONDecodeError
+            logger.warning("invalid_json", error=str(e))
+            await self._send_error(400, "Invalid JSON message")
+            return
+        await self._handle_message(data)
+    
+    async def _handle_msgpack_frame(self, frame: bytes):
+        """Tagged msgpack control message (msgpack-v1 subprotocol)."""
+        try:
+            data = decode_msgpack(memoryview(frame)[1:])
+        except Exception as e:
+            logger.warning("invalid_msgpack", error=str(e))
+            await self._send_error(400, "Invalid msgpack message")
+            return
+        await self._handle_message(data)
     
     async def _handle_binary_audio(self, audio_bytes: bytes):
         """
@@ -402,66 +646,42 @@ class VoiceSessionHandler:
         if self.session.state not in [SessionState.IDLE, SessionState.LISTENING]:
             if self.session.state in [SessionState.GENERATING, SessionState.SPEAKING]:
                 # Check for speech to interrupt
-                import numpy as np
-                audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
-                rms_energy = np.sqrt(np.mean(audio_array.astype(np.float32) ** 2))
+                rms_energy = _speech_energy(audio_bytes)
                 
-                if rms_energy > 300:
-                    logger.info("binary_speech_interrupt", energy=int(rms_energy))
+                if rms_energy is not None:
+                    logger.info("binary_speech_interrupt", energy=rms_energy)
                     await self._handle_interrupt()
             return
         
         # Transition to listening if idle
         if self.session.state == SessionState.IDLE:
             await self.session.transition_state(SessionState.LISTENING)
+            self._final_event.clear()
         
         # Process audio through ASR
         is_final_received = await self.pipeline.process_audio_frame(self.session, audio_bytes)
         
         if is_final_received:
+            # ASR owns final dispatch; frame handlers only drain the pipeline's copy
             final_text = self.pipeline.get_pending_final_transcript()
-            if final_text and not self._is_processing:
-                asyncio.create_task(self._process_final_transcript(final_text))
+            if final_text and not self._asr_owns_finals:
+                self._queue_final_transcript(final_text)
     
     async def _handle_message(self, data: dict):
         """Route and handle incoming messages."""
-        msg_type = data.get("type")
-        
-        if msg_type == MessageType.SESSION_START:
-            await self._handle_session_start(data)
-        elif msg_type == MessageType.AUDIO_FRAME:
-            await self._handle_audio_frame(data)
-        elif msg_type == MessageType.IMAGE_FRAME:
-            await self._handle_image_frame(data)
-        elif msg_type == MessageType.INTERRUPT:
-            await self._handle_interrupt()
-        elif msg_type == MessageType.LANGUAGE_CHANGE:
-            await self._handle_language_change(data)
-        elif msg_type == MessageType.VOICE_CHANGE:
-            await self._handle_voice_change(data)
-        elif msg_type == MessageType.TTS_PROVIDER_CHANGE:
-            await self._handle_tts_provider_change(data)
-        elif msg_type == MessageType.TTS_SPEED_CHANGE:
-            await self._handle_tts_speed_change(data)
-        elif msg_type == MessageType.PERSONALITY_CHANGE:
-            await self._handle_personality_change(data)
-        elif msg_type == MessageType.SPEECH_FINISHED:
-            await self._handle_speech_finished()
-        elif msg_type == MessageType.HEARTBEAT:
-            await self._handle_heartbeat()
-        elif msg_type == "ping":
-            # Respond to client ping with pong
-            await self._send_message({"type": "pong", "timestamp": data.get("timestamp")})
-        elif msg_type == "pong":
-            # Client responded to our ping - connection is alive
-            pass
-        elif msg_type == MessageType.SESSION_END:
-            await self._handle_session_end()
-        elif msg_type == MessageType.ROBOT_STATUS:
-            logger.info("robot_status_message_received", data=data)
-            await self._handle_robot_status(data)
-        else:
-            logger.warning("unknown_message_type", type=msg_type)
+        # OPTIMIZED: one dict lookup instead of a 15-arm string-compare ladder
+        handler = self._handlers.get(data.get("type"))
+        if handler is None:
+            logger.warning("unknown_message_type", type=data.get("type"))
+            return
+        await handler(data)
+    
+    async def _handle_ping(self, data: dict):
+        """Respond to client ping with pong."""
+        await self._send_message({"type": "pong", "timestamp": data.get("timestamp")})
+    
+    async def _handle_pong(self, data: dict):
+        """Client responded to our ping - connection is alive."""
 
     async def _handle_voice_change(self, data: dict):
         """Handle voice change message."""
@@ -470,7 +690,6 @@ class VoiceSessionHandler:
             return
         
         try:
-            from core.protocol import VoiceChangeMessage
             msg = VoiceChangeMessage(**data)
             
             # Update session voice preference
@@ -490,7 +709,6 @@ class VoiceSessionHandler:
             return
         
         try:
-            from core.protocol import TtsProviderChangeMessage
             msg = TtsProviderChangeMessage(**data)
             
             # Update session TTS preference
@@ -510,7 +728,6 @@ class VoiceSessionHandler:
             return
         
         try:
-            from core.protocol import TtsSpeedChangeMessage
             msg = TtsSpeedChangeMessage(**data)
             
             # Update session speaking rate
@@ -530,11 +747,10 @@ class VoiceSessionHandler:
             return
         
         try:
-            from core.protocol import PersonalityChangeMessage
             msg = PersonalityChangeMessage(**data)
             
-            # Update session personality
-            self.session.config.personality = msg.personality
+            # Update session personality (until the next global change)
+            self.session.set_personality_override(msg.personality)
             
             logger.info("personality_changed", 
                        session_id=self.session.session_id, 
@@ -544,7 +760,7 @@ class VoiceSessionHandler:
             logger.error("personality_change_error", error=str(e))
             await self._send_error(400, f"Invalid personality change: {str(e)}")
 
-    async def _handle_speech_finished(self):
+    async def _handle_speech_finished(self, data: Optional[dict] = None):
         """Handle explicit signal that speech has finished."""
         if not self.session or not self.pipeline:
             return
@@ -572,9 +788,11 @@ class VoiceSessionHandler:
             # Race condition handling:
             # Sometimes the final transcript comes slightly *after* we ask to finalize,
             # because the ASR stream closure takes a few ms to trigger the final event.
-            # We wait briefly and check for a pending final in the pipeline.
-            import asyncio
-            await asyncio.sleep(0.1) # 100ms wait for stragglers
+            # We wait (up to 100ms) for the final callback, then check the pipeline.
+            try:
+                await asyncio.wait_for(self._final_event.wait(), timeout=0.1)
+            except asyncio.TimeoutError:
+                pass
             
             # Check AGAIN if processing started (callback might have fired during sleep)
             if self._is_processing:
@@ -583,8 +801,8 @@ class VoiceSessionHandler:
             
             pending = self.pipeline.get_pending_final_transcript()
             if pending:
-                logger.info("found_pending_final_after_wait", text=pending[:50])
-                asyncio.create_task(self._process_final_transcript(pending))
+                logger.info("found_pending_final_after_wait", text=pending)
+                self._queue_final_transcript(pending)
                 return
         
         # If still no result and not processing, go to IDLE
@@ -594,6 +812,7 @@ class VoiceSessionHandler:
 
     async def _handle_robot_status(self, data: dict):
         """Handle robot connection status update from client."""
+        logger.info("robot_status_message_received", data=data)
         if not self.session:
             return
         
@@ -619,12 +838,9 @@ class VoiceSessionHandler:
             # IMPORTANT: Load saved personality from server settings (overrides client)
             saved_settings = load_settings()
             saved_personality = saved_settings.get("personality", "assistant")
-            if saved_personality == "human":
-                self.session.config.personality = Personality.HUMAN
-            elif saved_personality == "general":
-                self.session.config.personality = Personality.GENERAL
-            else:
-                self.session.config.personality = Personality.ASSISTANT
+            saved_enum = _PERSONALITY_MAP.get(saved_personality, Personality.ASSISTANT)
+            if saved_enum != session_manager.global_personality:
+                session_manager.set_global_personality(saved_enum)
             logger.info("session_personality_loaded", 
                        session_id=self.session.session_id,
                        personality=saved_personality)
@@ -635,6 +851,7 @@ class VoiceSessionHandler:
             # Register callback for final transcripts - DIRECT TRIGGER!
             if hasattr(self.pipeline.asr, 'set_final_callback'):
                 self.pipeline.asr.set_final_callback(self._on_final_transcript)
+                self._asr_owns_finals = True
                 logger.info("registered_final_callback", session_id=self.session.session_id)
             
             # Register speculative callback for early LLM execution
@@ -657,11 +874,23 @@ class VoiceSessionHandler:
             await self._send_error(400, "No active session")
             return
         
+        # DEPRECATED: Base64 costs a Python-level decode + 33% bandwidth per frame;
+        # clients should send raw PCM as binary frames (_handle_binary_audio)
+        if not self._json_audio_warned:
+            self._json_audio_warned = True
+            logger.warning("deprecated_json_audio",
+                          session_id=self.session.session_id,
+                          allowed=config.server.allow_json_audio)
+            if not config.server.allow_json_audio:
+                await self._send_error(415, "JSON audio deprecated; use binary frames")
+        if not config.server.allow_json_audio:
+            return
+        
         try:
             msg = AudioFrameMessage(**data)
             
-            # Decode audio data
-            audio_bytes = base64.b64decode(msg.data)
+            # Decode audio data (still a full copy + decode per frame)
+            audio_bytes = _b64decode(msg.data)
             
             # Update activity
             self.session.update_activity()
@@ -671,21 +900,20 @@ class VoiceSessionHandler:
             if self.session.state not in [SessionState.IDLE, SessionState.LISTENING]:
                 if self.session.state in [SessionState.GENERATING, SessionState.SPEAKING]:
                     # Check if this is actual speech (not silence/noise) before interrupting
-                    import numpy as np
-                    audio_array = np.frombuffer(audio_bytes, dtype=np.int16)
-                    rms_energy = np.sqrt(np.mean(audio_array.astype(np.float32) ** 2))
+                    rms_energy = _speech_energy(audio_bytes)
                     
-                    # Only interrupt if energy is above speech threshold (300 is typical for speech)
-                    if rms_energy > 300:
+                    # Only interrupt if energy is above speech threshold
+                    if rms_energy is not None:
                         logger.info("speech_detected_during_response", 
                                   session_id=self.session.session_id, 
-                                  energy=int(rms_energy))
+                                  energy=rms_energy)
                         await self._handle_interrupt()
                 return
             
             # Transition to listening if idle
             if self.session.state == SessionState.IDLE:
                 await self.session.transition_state(SessionState.LISTENING)
+                self._final_event.clear()
             
             # Process audio through ASR
             is_final_received = await self.pipeline.process_audio_frame(self.session, audio_bytes)
@@ -695,16 +923,15 @@ class VoiceSessionHandler:
             # If final transcript received, immediately trigger pipeline!
             if is_final_received:
                 logger.info("is_final_TRUE_getting_transcript", session_id=self.session.session_id)
+                # ASR owns final dispatch; frame handlers only drain the pipeline's copy
                 final_text = self.pipeline.get_pending_final_transcript()
-                logger.info("got_pending_final", text=final_text[:50] if final_text else "None")
-                if final_text:
+                logger.info("got_pending_final", text=final_text)
+                if final_text and not self._asr_owns_finals:
                     logger.info("final_received_triggering_pipeline",
                                session_id=self.session.session_id, 
-                               text=final_text[:50])
+                               text=final_text)
                     # Don't await - run in background so we can continue processing audio for interrupts
-                    if not self._is_processing:
-                        asyncio.create_task(self._process_final_transcript(final_text))
-                    else:
+                    if not self._queue_final_transcript(final_text):
                         logger.warning("already_processing_cannot_start_new", session_id=self.session.session_id)
             
         except Exception as e:
@@ -726,7 +953,8 @@ class VoiceSessionHandler:
             
             # PROACTIVE: Start vision analysis immediately in parallel with ASR
             # By the time user finishes speaking, vision analysis may be done!
-            from engines.vision import get_vision_engine
+            if get_vision_engine is None:
+                return
             vision = get_vision_engine()
             vision.receive_image_and_preanalyze(self.session.session_id, image_data)
             logger.info("proactive_vision_started", session_id=self.session.session_id[:8])
@@ -743,7 +971,7 @@ class VoiceSessionHandler:
             return
         
         logger.info("FINAL_CALLBACK_TRIGGERED", 
-                   text=asr_result.text[:50], 
+                   text=asr_result.text, 
                    confidence=asr_result.confidence)
         
         # Send to client
@@ -753,13 +981,16 @@ class VoiceSessionHandler:
             language=asr_result.language
         ))
         
-        # Immediately trigger pipeline if not already processing
+        self._final_event.set()
+        
+        # Immediately trigger pipeline; _queue_final_transcript rejects it while a turn
+        # is running, but a newer final replaces one still waiting in the queue
         # We allow LISTENING (normal flow) and IDLE (late arrival after PTT release)
         valid_states = [SessionState.LISTENING, SessionState.TRANSCRIBING, SessionState.IDLE]
         
-        if not self._is_processing and self.session.state in valid_states:
-            logger.info("triggering_pipeline_from_callback", text=asr_result.text[:50])
-            asyncio.create_task(self._process_final_transcript(asr_result.text))
+        if self.session.state in valid_states:
+            logger.info("triggering_pipeline_from_callback", text=asr_result.text)
+            self._queue_final_transcript(asr_result.text)
         else:
             logger.warning("cannot_process_final", 
                           is_processing=self._is_processing,
@@ -777,71 +1008,96 @@ class VoiceSessionHandler:
         if self._is_processing:
             return
         
+        # Admission: one prefetch per utterance, and only while the server has headroom
+        if self.pipeline.speculative_rag_started:
+            return
+        if _speculative_rag_inflight >= MAX_SPECULATIVE_RAG_INFLIGHT:
+            logger.debug("speculative_rag_skipped_busy", inflight=_speculative_rag_inflight)
+            return
+        self.pipeline.speculative_rag_started = True
+        
         logger.info("SPECULATIVE_TRIGGERED", 
-                   text=asr_result.text[:50], 
+                   text=asr_result.text, 
                    confidence=asr_result.confidence)
         
-        # Start pre-warming: RAG search in background
-        # This result will be reused when final transcript arrives
+        # Start pre-warming: RAG search + tool decision in background, concurrently
+        # These results will be reused when final transcript arrives
+        if _EMPTY_CONTEXT is not None:
+            asyncio.get_running_loop().create_task(
+                self._speculative_prewarm(asr_result.text), context=_EMPTY_CONTEXT
+            )
+        else:
+            asyncio.create_task(self._speculative_prewarm(asr_result.text))
+    
+    async def _speculative_prewarm(self, text: str):
+        """Fan out the speculative RAG and tool-check prefetches so they overlap."""
+        await asyncio.gather(
+            self._precompute_rag(text),
+            self._precompute_tool_check(text),
+            return_exceptions=True
+        )
+    
+    async def _precompute_tool_check(self, text: str):
+        """Pre-compute the LLM tool decision for speculative execution."""
+        if not self.session or not self.pipeline:
+            return
         try:
-            from engines.rag import get_faq_context
-            # Pre-compute RAG context (won't block main flow)
-            asyncio.create_task(self._precompute_rag(asr_result.text))
-        except ImportError:
-            pass
+            await self.pipeline.llm.prefetch_tool_decision(
+                text, self.session.session_id, robot_enabled=self.session.robot_connected
+            )
+        except Exception as e:
+            logger.debug("tool_check_precompute_failed", error=str(e))
     
     async def _precompute_rag(self, text: str):
         """Pre-compute RAG context for speculative execution."""
+        global _speculative_rag_inflight
+        if get_faq_context is None:
+            return
+        _speculative_rag_inflight += 1
         try:
-            from engines.rag import get_faq_context
-            result = get_faq_context(text, top_k=3)
+            result = await get_faq_context(text, top_k=3)
             if result:
-                logger.info("rag_precomputed", text=text[:30], result_len=len(result))
+                logger.info("rag_precomputed", text=text, result_len=len(result))
+                if self.pipeline:
+                    self.pipeline.cache_rag(text, result)
         except Exception as e:
             logger.debug("rag_precompute_failed", error=str(e))
+        finally:
+            _speculative_rag_inflight -= 1
     
-    async def _check_asr_queue(self):
-        """
-        Background task that checks ASR queue for final results.
-        Needed because: User releases button → audio stops → but Google still
-        sends is_final=True to queue → no audio frame to process it!
+    def _queue_final_transcript(self, transcript: str) -> bool:
+        """Hand a final transcript to the consumer; False if a turn is already running."""
+        if self._is_processing and self._final_queue.empty():
+            logger.warning("already_processing_skipping",
+                          session_id=self.session.session_id if self.session else None)
+            return False
+        # Claimed at enqueue time; a newer final replaces one that hasn't started yet
+        self._is_processing = True
+        self._turn_generation += 1
+        if self._final_queue.put_nowait(transcript):
+            logger.info("stale_final_replaced", text=transcript)
+        return True
+    
+    async def _final_consumer(self):
         """
-        logger.info("queue_checker_started")
+        Run queued final transcripts through the pipeline, one at a time.
         
+        The pipeline is awaited here, never in the message loop, so interrupts and
+        heartbeats are serviced while a turn runs; _handle_interrupt cancels
+        _processing_task directly.
+        """
+        queue = self._final_queue
         while True:
-            try:
-                if not self.session or not self.pipeline:
-                    await asyncio.sleep(0.1)
-                    continue
-                
-                # Only check when LISTENING and not processing
-                if self.session.state == SessionState.LISTENING and not self._is_processing:
-                    # Check if there's a pending final transcript
-                    final_text = self.pipeline.get_pending_final_transcript()
-                    if final_text:
-                        logger.info("queue_checker_found_final", text=final_text[:50])
-                        asyncio.create_task(self._process_final_transcript(final_text))
-                
-                await asyncio.sleep(0.05)  # Check every 50ms
-                
-            except asyncio.CancelledError:
-                logger.info("queue_checker_cancelled")
-                break
-            except Exception as e:
-                logger.error("queue_checker_error", error=str(e))
-                await asyncio.sleep(0.1)
+            transcript = await queue.get()
+            await self._process_final_transcript(transcript)
     
     async def _process_final_transcript(self, transcript: str):
         """Process a final transcript and run the LLM pipeline."""
         if not self.session or not self.pipeline:
+            self._is_processing = False
             return
         
-        if self._is_processing:
-            logger.warning("already_processing_skipping", session_id=self.session.session_id)
-            return
-        
-        self._is_processing = True
-        
+        generation = self._turn_generation
         try:
             # Transition to transcribing FIRST to stop new audio processing
             await self.session.transition_state(SessionState.TRANSCRIBING)
@@ -849,7 +1105,7 @@ class VoiceSessionHandler:
             logger.info(
                 "transcript_finalized",
                 session_id=self.session.session_id,
-                text=transcript[:100]
+                text=transcript
             )
             
             # Cancel any existing processing task
@@ -861,38 +1117,45 @@ class VoiceSessionHandler:
                 self.pipeline.run_full_pipeline(self.session, transcript)
             )
             
-            # Wait for pipeline to complete
+            # Wait for pipeline to complete (on the consumer task, not the message loop)
             await self._processing_task
             
         except asyncio.CancelledError:
             logger.info("processing_cancelled", session_id=self.session.session_id)
+            # Interrupts cancel only the pipeline task; cleanup (connection gone) cancels the consumer too
+            if not self._connection_alive:
+                raise
         except Exception as e:
             logger.error("processing_error", session_id=self.session.session_id, error=str(e))
             # Return to idle on error
             if self.session.state != SessionState.CLOSED:
                 await self.session.transition_state(SessionState.IDLE)
         finally:
-            self._is_processing = False
-            # Reset for next utterance
-            if self.pipeline:
-                await self.pipeline.reset_for_new_utterance(self.session)
+            # An interrupt (already reset) or a newer utterance owns the state now
+            if generation == self._turn_generation:
+                self._is_processing = False
+                # Reset for next utterance
+                if self.pipeline:
+                    await self.pipeline.reset_for_new_utterance(self.session)
     
-    async def _handle_interrupt(self):
+    async def _handle_interrupt(self, data: Optional[dict] = None):
         """Handle interrupt signal."""
         if not self.session:
             return
         
         logger.info("interrupt_received", session_id=self.session.session_id)
+        self._turn_generation += 1
         
-        # Cancel processing task
-        if self._processing_task and not self._processing_task.done():
-            self._processing_task.cancel()
-            try:
-                await self._processing_task
-            except asyncio.CancelledError:
-                pass
+        # OPTIMIZED: cancel and wait only briefly for the pipeline's teardown - the
+        # acknowledgement below no longer depends on how long a slow teardown takes
+        task = self._processing_task
+        self._cancel_and_forget(task)
+        if task and not task.done():
+            await asyncio.wait({task}, timeout=INTERRUPT_TEARDOWN_WAIT)
         
-        # Handle interrupt in session
+        # Handle interrupt in session (moves straight to LISTENING - the previous
+        # turn's final must not satisfy the next speech_finished wait)
+        self._final_event.clear()
         await self.session.handle_interrupt()
         
         # Reset pipeline
@@ -909,35 +1172,43 @@ class VoiceSessionHandler:
             return
         
         try:
-            from core.protocol import LanguageChangeMessage
-            msg = LanguageChangeMessage(**data)
+            # OPTIMIZED: skip pydantic validation for a language value seen before
+            raw = data.get("language")
+            language = _LANGUAGE_CACHE.get(raw) if isinstance(raw, str) else None
+            if language is None:
+                language = LanguageChangeMessage(**data).language
+                if isinstance(raw, str):
+                    _LANGUAGE_CACHE[raw] = language
             
             # Update session language preference
-            self.session.config.language_preference = msg.language
+            self.session.config.language_preference = language
             
             logger.info("language_changed", 
                        session_id=self.session.session_id, 
-                       new_language=msg.language.value)
+                       new_language=language.value)
             
         except Exception as e:
             logger.error("language_change_error", error=str(e))
             await self._send_error(400, f"Invalid language change: {str(e)}")
     
-    async def _handle_heartbeat(self):
+    async def _handle_heartbeat(self, data: Optional[dict] = None):
         """Handle heartbeat message."""
-        await self.websocket.send_json(HeartbeatAckMessage().model_dump())
+        timestamp = int(time.time() * 1000)
+        if self._msgpack:
+            await self._send_message({"type": _HEARTBEAT_ACK_TYPE, "timestamp": timestamp})
+        else:
+            await self.websocket.send_text(f"{_HEARTBEAT_ACK_JSON_PREFIX}{timestamp}}}")
         
         if self.session:
             self.session.update_activity()
     
-    async def _handle_session_end(self):
+    async def _handle_session_end(self, data: Optional[dict] = None):
         """Handle session end message."""
         if self.session:
             logger.info("session_end_requested", session_id=self.session.session_id)
             
             # Clean up vision session data
             try:
-                from engines.vision import get_vision_engine
                 vision = get_vision_engine()
                 if vision._initialized:
                     vision.clear_session(self.session.session_id)
@@ -947,29 +1218,19 @@ class VoiceSessionHandler:
             await session_manager.remove_session(self.session.session_id)
             self.session = None
     
+    async def _send_message(self, data: dict):
+        """Send a control message in the negotiated wire format."""
+        await send_control_message(self.websocket, data)
+    
     async def _send_error(self, code: int, message: str):
         """Send error message to client."""
-        await self.websocket.send_json(
-            ErrorMessage(code=code, message=message).model_dump()
-        )
+        await send_control_model(self.websocket, ErrorMessage(code=code, message=message))
     
     async def _cleanup(self):
         """Cleanup resources."""
-        # Cancel queue checker
-        if self._queue_checker_task and not self._queue_checker_task.done():
-            self._queue_checker_task.cancel()
-            try:
-                await self._queue_checker_task
-            except asyncio.CancelledError:
-                pass
-        
-        # Cancel processing task
-        if self._processing_task and not self._processing_task.done():
-            self._processing_task.cancel()
-            try:
-                await self._processing_task
-            except asyncio.CancelledError:
-                pass
+        # Cancel processing task and the final transcript consumer; teardown finishes in background
+        self._cancel_and_forget(self._processing_task)
+        self._cancel_and_forget(self._final_consumer_task)
         
         # Remove session
         if self.session:
@@ -985,9 +1246,30 @@ async def voice_endpoint(websocket: WebSocket):
 
 # ============== Main Entry Point ==============
 
+# Kernel TCP keepalive: first probe after this idle time, then every interval, drop after count
+TCP_KEEPALIVE_IDLE = 25  # seconds
+TCP_KEEPALIVE_INTERVAL = 10  # seconds
+TCP_KEEPALIVE_COUNT = 3
+
+
+def _tune_listen_socket(sock: socket.socket) -> None:
+    """TCP keepalive + no Nagle on the listening socket - accepted connections inherit both (Linux)."""
+    try:
+        # Small transcript/control frames go out immediately, not after a delayed ACK
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):  # Not on macOS/Windows
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, TCP_KEEPALIVE_INTERVAL)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, TCP_KEEPALIVE_COUNT)
+    except OSError as e:
+        logger.warning("socket_tuning_failed", error=str(e))
+
+
 def main():
     """Main entry point."""
     import uvicorn
+    from uvicorn.supervisors import Multiprocess
     
     logger.info(
         "starting_zeni_server",
@@ -995,14 +1277,30 @@ def main():
         port=config.server.port
     )
     
-    uvicorn.run(
+    uvicorn_config = uvicorn.Config(
         "server:app",
         host=config.server.host,
         port=config.server.port,
+        # OPTIMIZED: C-accelerated loop/HTTP parser pinned explicitly (no "auto" fallback),
+        # and no per-request access log line
         loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
+        access_log=False,
         workers=config.server.workers,
         log_level=config.server.log_level.lower()
     )
+    server = uvicorn.Server(uvicorn_config)
+    
+    # Bind the socket ourselves (as uvicorn.run does) so it can be tuned first
+    sock = uvicorn_config.bind_socket()
+    _tune_listen_socket(sock)
+    if uvicorn_config.workers > 1:
+        Multiprocess(uvicorn_config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run(sockets=[sock])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+"""Final transcripts are latest-wins until the consumer picks one up."""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fastapi")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.protocol import Language, SessionState  # noqa: E402
+from server import VoiceSessionHandler  # noqa: E402
+
+
+def test_newer_final_replaces_queued_one():
+    async def scenario():
+        handler = VoiceSessionHandler(websocket=SimpleNamespace())
+        sent = []
+
+        async def send_message(message):
+            sent.append(message)
+
+        handler.session = SimpleNamespace(
+            session_id="test", state=SessionState.LISTENING, send_message=send_message
+        )
+        handler.pipeline = SimpleNamespace()
+
+        processed = []
+
+        async def process(transcript):
+            processed.append(transcript)
+            handler._is_processing = False
+
+        handler._process_final_transcript = process
+
+        # Both finals arrive through the ASR callback before the consumer runs
+        for text in ("first", "second"):
+            await handler._on_final_transcript(
+                SimpleNamespace(text=text, confidence=0.9, language=Language.ENGLISH)
+            )
+
+        consumer = asyncio.ensure_future(handler._final_consumer())
+        await asyncio.sleep(0.01)
+        consumer.cancel()
+
+        assert processed == ["second"]
+        assert len(sent) == 2
+
+    asyncio.run(scenario())